@@ -0,0 +1,114 @@
+# benchmarks/fixtures.py
+import random
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+import reuters_parser
+from parsers import epravda_parser, minfin_parser, coindesk_parser
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+BLOOMBERG_URL = "https://www.bloomberg.com/markets"
+
+_MONTHS = list(epravda_parser.UA_MONTHS)
+_WORDS = (
+    "НБУ гривня курс інфляція бюджет банки депозити ставка кредит податки "
+    "експорт зерно енергетика облігації ринок біткоїн ETF долар євро нафта"
+).split()
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 12))).capitalize()
+
+def _days(n: int) -> list[date]:
+    # свіжі дати, щоб наскрізний прогін проходив фільтр «сьогодні+вчора»
+    today = date.today()
+    return [today - timedelta(days=min(i // 20, 3)) for i in range(n)]
+
+def _page(body: str, rng: random.Random) -> str:
+    # «вага» справжньої сторінки: меню, футер, інлайн-скрипти
+    nav = "".join(f'<li><a href="/menu/{i}">{_title(rng)}</a></li>' for i in range(120))
+    script = "var state = " + "{" + ",".join(f'"k{i}": "{"x" * 40}"' for i in range(600)) + "};"
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>fixture</title>"
+        f"<script>{script}</script></head><body><header><ul class=\"menu\">{nav}</ul></header>"
+        f"<main>{body}</main><footer><ul>{nav}</ul></footer></body></html>"
+    )
+
+def _epravda(rng: random.Random) -> str:
+    cards = []
+    for i, d in enumerate(_days(60)):
+        cards.append(
+            f'<div class="article_news"><div class="article_title">'
+            f'<a href="/news/2025/{i}/">{_title(rng)}</a></div>'
+            f'<div class="article_date">{d.day} {_MONTHS[d.month - 1]}, {rng.randint(0, 23):02d}:00</div></div>'
+        )
+    return _page("".join(cards), rng)
+
+def _minfin(rng: random.Random, section: int, total: int = 4) -> str:
+    # загальна стрічка (останній розділ) наполовину повторює підрозділи
+    ids = [section * 1000 + i for i in range(50)]
+    if section == total - 1:
+        ids = [s * 1000 + i for s in range(total - 1) for i in range(0, 50, 3)] + ids[:50]
+    rows = []
+    for n, d in zip(ids, _days(len(ids))):
+        rows.append(
+            f'<li class="item"><span class="data" content="{d.isoformat()} 10:00">{d:%d.%m.%Y}</span>'
+            f'<a href="/ua/news/{n}/">{_title(rng)}</a></li>'
+        )
+    return _page(f'<ul class="news-list">{"".join(rows)}</ul>', rng)
+
+def _coindesk(rng: random.Random) -> str:
+    cards = []
+    for i, d in enumerate(_days(40)):
+        href = f"/uk/markets/{d:%Y/%m/%d}/story-{i}/"
+        cards.append(
+            f'<div class="card"><h3>{_title(rng)}</h3><a href="{href}"><img src="x.png"></a>'
+            f'<a href="{href}">{_title(rng)}</a></div>'
+        )
+    return _page("".join(cards), rng)
+
+def _rss(rng: random.Random) -> str:
+    now = datetime.now(timezone.utc)
+    items = "".join(
+        f"<item><title>{_title(rng)} - Reuters</title><link>https://news.google.com/rss/articles/{i}</link>"
+        f"<pubDate>{format_datetime(now - timedelta(hours=i))}</pubDate><source>Reuters</source></item>"
+        for i in range(100)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Reuters</title>{items}</channel></rss>'
+
+def _bloomberg(rng: random.Random) -> str:
+    links = "".join(
+        f'<a data-type="article" href="/news/articles/2025-01-01/story-{i}">{_title(rng)}</a>'
+        for i in range(30)
+    )
+    return _page(links, rng)
+
+# назва -> (адреса, генератор синтетичної сторінки)
+FIXTURES = {
+    "epravda_finances": (epravda_parser.FINANCES_URL, _epravda),
+    **{
+        f"minfin_{i}": (url, lambda rng, i=i: _minfin(rng, i, len(minfin_parser.SOURCE_URLS)))
+        for i, url in enumerate(minfin_parser.SOURCE_URLS)
+    },
+    "coindesk_latest": (coindesk_parser.SOURCE_URL, _coindesk),
+    "reuters_rss": (reuters_parser.RSS_URL, _rss),
+    "bloomberg_markets": (BLOOMBERG_URL, _bloomberg),
+}
+
+def path(name: str) -> Path:
+    return FIXTURES_DIR / f"{name}.{'xml' if name.endswith('_rss') else 'html'}"
+
+def recorded(name: str) -> bool:
+    return path(name).exists()
+
+def load(name: str) -> bytes:
+    # записана сторінка, якщо є (record.py), інакше детермінована синтетична
+    p = path(name)
+    if p.exists():
+        return p.read_bytes()
+    _, generate = FIXTURES[name]
+    return generate(random.Random(name)).encode("utf-8")
+
+def by_url() -> dict[str, str]:
+    return {url: name for name, (url, _) in FIXTURES.items()}
@@ -0,0 +1,30 @@
+# benchmarks/record.py — знімає справжні сторінки у benchmarks/fixtures/
+import asyncio
+import logging
+
+from core import http_client
+from benchmarks.fixtures import FIXTURES, FIXTURES_DIR, path
+from parsers.epravda_parser import HEADERS
+
+log = logging.getLogger("news-bot.benchmarks")
+
+async def record(names=None):
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    try:
+        for name, (url, _) in FIXTURES.items():
+            if names and name not in names:
+                continue
+            try:
+                body = await http_client.fetch_bytes(url, headers=HEADERS)
+            except Exception as e:
+                log.warning("Не вдалося записати %s (%s): %s", name, url, e)
+                continue
+            path(name).write_bytes(body)
+            print(f"✅ {name}: {len(body)} байт")
+    finally:
+        await http_client.close()
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(record(sys.argv[1:] or None))
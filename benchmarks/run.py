@@ -0,0 +1,371 @@
+# benchmarks/run.py
+"""Офлайн-бенчмарк парсерів.
+
+    python -m benchmarks.run [--repeat 20] [--out benchmarks/results.json] [--items 100000] [--stories 5000]
+                             [--baseline old.json] [--threshold 10] [--fail-on-regression]
+
+Сторінки беруться з benchmarks/fixtures/ (записати: python -m benchmarks.record),
+а якщо їх там немає — генеруються синтетичні з тією ж розміткою.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import pickle
+import random
+import hashlib
+import argparse
+import platform
+import statistics
+import tempfile
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+from urllib.parse import quote, unquote
+
+# архів новин під час прогону — у тимчасовий файл, а не в робочу news.db
+os.environ.setdefault("NEWS_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="news-bench-"), "news.db"))
+
+from aiohttp import web
+
+import reuters_parser
+from benchmarks import fixtures
+from core import executor, feeds, html_backends, http_client, items as news_items, neardup, page_cache
+from core.items import NewsItem
+from groups import easy_sources
+from parsers import epravda_parser, minfin_parser, coindesk_parser
+
+DEFAULT_OUT = os.path.join(os.path.dirname(__file__), "results.json")
+
+def _parser_cases() -> list[tuple[str, str, callable, tuple, bool]]:
+    # (назва, фікстура, екстрактор, аргументи, чи приймає backend)
+    cases = [("epravda._collect_finances", "epravda_finances", epravda_parser._collect_finances, (), True)]
+    for i, url in enumerate(minfin_parser.SOURCE_URLS):
+        cases.append((f"minfin._collect_section[{i}]", f"minfin_{i}", minfin_parser._collect_section, (url,), True))
+    cases.append(("coindesk._collect_latest", "coindesk_latest", coindesk_parser._collect_latest, (), True))
+    cases.append(("reuters.parse_rss", "reuters_rss", reuters_parser.parse_rss, (), False))
+    try:
+        import bloomberg_parser
+    except ImportError as e:
+        print(f"⚠️ bloomberg пропущено: {e}")
+    else:
+        cases.append(("bloomberg._extract", "bloomberg_markets",
+                      lambda html: bloomberg_parser._extract(html, 1000), (), False))
+    return cases
+
+def _measure(call, repeat: int) -> dict:
+    items = len(call())  # прогрів + кількість
+    times = timeit.repeat(call, number=1, repeat=repeat)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(times)
+    return {
+        "items": items,
+        "median_ms": round(median * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "items_per_sec": round(items / median, 1) if median else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def bench_parsers(repeat: int) -> dict:
+    results = {}
+    backends = [b for b in html_backends.BACKENDS if html_backends._available(b)]
+    for name, fixture, fn, args, takes_backend in _parser_cases():
+        html = fixtures.load(fixture)
+        entry = {"fixture": fixture, "bytes": len(html)}
+        if takes_backend:
+            for backend in backends:
+                entry[backend] = _measure(lambda: fn(html, *args, backend=backend), repeat)
+            entry["backends_agree"] = html_backends.compare_backends(fn, html, *args)
+        else:
+            entry["default"] = _measure(lambda: fn(html, *args), repeat)
+        results[name] = entry
+        print(f"• {name}: " + ", ".join(
+            f"{k} {v['median_ms']} мс" for k, v in entry.items() if isinstance(v, dict) and "median_ms" in v
+        ))
+    return results
+
+def _item_rows(n: int) -> list[tuple]:
+    # як у справжньому збиранні: кілька стрічок, сотні новин на кожну
+    rng = random.Random(1)
+    feeds_ = [
+        (epravda_parser.SOURCE_URL, "finances"), (coindesk_parser.SOURCE_URL, "coindesk-uk"),
+        (reuters_parser.SOURCE_URL, "reuters-business"),
+    ] + [(u, None) for u in minfin_parser.SOURCE_URLS]
+    today = date.today()
+    rows = []
+    for i in range(n):
+        # рядки з мережі: окремі об'єкти, а не спільні літерали
+        url, section = feeds_[i % len(feeds_)]
+        rows.append((
+            fixtures._title(rng), f"{url}/news/{i}/", today - timedelta(days=i % 3),
+            "".join(url), section and "".join(section),
+        ))
+    return rows
+
+def _peak(build) -> tuple[object, int]:
+    tracemalloc.start()
+    try:
+        value = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, current
+
+def _timing(call, repeat: int) -> float:
+    return round(min(timeit.repeat(call, number=1, repeat=repeat)) * 1000, 3)
+
+def bench_items(n: int, repeat: int) -> dict:
+    """Пам'ять і (де)серіалізація n новин: словники проти NewsItem."""
+    # рядки будуються всередині вимірювання: копії URL стрічок у словниках теж рахуються
+    dicts, dict_bytes = _peak(lambda: [
+        {"title": t, "url": u, "date": d.strftime("%Y-%m-%d"), "source": s, "section": sec}
+        for t, u, d, s, sec in _item_rows(n)
+    ])
+    objs, obj_bytes = _peak(lambda: [NewsItem.new(t, u, d, s, sec) for t, u, d, s, sec in _item_rows(n)])
+    assert [o.date for o in objs[:50]] == [d["date"] for d in dicts[:50]]
+
+    payloads = {
+        "dict_json": json.dumps(dicts, ensure_ascii=False).encode("utf-8"),
+        "dict_pickle": pickle.dumps(dicts, pickle.HIGHEST_PROTOCOL),
+        "item_pickle": pickle.dumps(objs, pickle.HIGHEST_PROTOCOL),
+        "item_binary": news_items.dumps(objs),
+    }
+    dumps = {
+        "dict_json": lambda: json.dumps(dicts, ensure_ascii=False).encode("utf-8"),
+        "dict_pickle": lambda: pickle.dumps(dicts, pickle.HIGHEST_PROTOCOL),
+        "item_pickle": lambda: pickle.dumps(objs, pickle.HIGHEST_PROTOCOL),
+        "item_binary": lambda: news_items.dumps(objs),
+    }
+    loads = {
+        "dict_json": lambda: json.loads(payloads["dict_json"]),
+        "dict_pickle": lambda: pickle.loads(payloads["dict_pickle"]),
+        "item_pickle": lambda: pickle.loads(payloads["item_pickle"]),
+        "item_binary": lambda: news_items.loads(payloads["item_binary"]),
+    }
+    assert news_items.loads(payloads["item_binary"]) == objs
+
+    results = {
+        "count": n,
+        "memory_kib": {"dict": round(dict_bytes / 1024, 1), "item": round(obj_bytes / 1024, 1)},
+        "formats": {
+            name: {
+                "bytes": len(payload),
+                "dumps_ms": _timing(dumps[name], repeat),
+                "loads_ms": _timing(loads[name], repeat),
+            }
+            for name, payload in payloads.items()
+        },
+    }
+    print(f"• {n} новин: dict {results['memory_kib']['dict']} KiB, NewsItem {results['memory_kib']['item']} KiB")
+    for name, r in results["formats"].items():
+        print(f"  {name}: {r['bytes']} B, dumps {r['dumps_ms']} мс, loads {r['loads_ms']} мс")
+    return results
+
+def _story_titles(n: int, dup_every: int = 10) -> tuple[list[str], list[tuple[int, int]]]:
+    # спільна фінансова лексика + рідкісні слова; кожен dup_every-й — переказ попереднього
+    rng = random.Random(2)
+    letters = "абвгдеєжзиіїйклмнопрстуфхцчшщьюя"
+    rare = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(3000)]
+    titles, pairs = [], []
+    for i in range(n):
+        if i % dup_every == dup_every - 1:
+            words = titles[-1].split()
+            words.pop(rng.randrange(len(words)))
+            words.insert(rng.randrange(len(words)), rng.choice(fixtures._WORDS))
+            pairs.append((i - 1, i))
+        else:
+            words = rng.sample(fixtures._WORDS, 2) + rng.sample(rare, 7)
+            rng.shuffle(words)
+        titles.append(" ".join(words))
+    return titles, pairs
+
+def bench_neardup(n: int) -> dict:
+    titles, pairs = _story_titles(n)
+    neardup.signature.cache_clear()
+    neardup._word_hashes.cache_clear()
+    t0 = time.perf_counter()
+    groups = neardup.clusters(titles)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    neardup.clusters(titles)
+    warm = time.perf_counter() - t0
+    root = {i: g[0] for g in groups for i in g}
+    index = neardup.StoryIndex()
+    for t in titles:
+        index.query(t)
+        index.add(t)
+    result = {
+        "titles": n,
+        "clusters": len(groups),
+        "recall": round(sum(root[a] == root[b] for a, b in pairs) / len(pairs), 4) if pairs else None,
+        "cold_ms": round(cold * 1000, 3),
+        "warm_ms": round(warm * 1000, 3),
+        # скільки пар довелося перевірити проти n*(n-1)/2 у повному переборі
+        "compared": index.compared,
+        "all_pairs": n * (n - 1) // 2,
+    }
+    print(f"• neardup {n}: {result['warm_ms']} мс (холодний {result['cold_ms']} мс), "
+          f"{result['clusters']} історій, recall {result['recall']}, пар {result['compared']}")
+    return result
+
+class StubServer:
+    """Локальний сервер фікстур з ETag/304, як у справжніх сайтів."""
+
+    def __init__(self):
+        self.names = fixtures.by_url()
+        self.bodies: dict[str, bytes] = {}
+        self.requests = 0
+        self._runner = None
+        self.port = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        name = self.names.get(unquote(request.match_info["url"]))
+        if name is None:
+            return web.Response(status=404)
+        body = self.bodies.get(name)
+        if body is None:
+            body = self.bodies[name] = fixtures.load(name)
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, headers={"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+    def rewrite(self, url: str) -> str:
+        return f"http://127.0.0.1:{self.port}/{quote(url, safe='')}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{url:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        http_client.set_url_rewrite(self.rewrite)
+
+    async def stop(self):
+        http_client.set_url_rewrite(None)
+        await self._runner.cleanup()
+
+def _cold():
+    page_cache.clear()
+    feeds.clear()
+
+async def _timed(coro_fn, repeat: int, cold: bool) -> dict:
+    times, items = [], 0
+    for _ in range(repeat):
+        if cold:
+            _cold()
+        t0 = time.perf_counter()
+        result = await coro_fn()
+        times.append(time.perf_counter() - t0)
+        items = len(result)
+    return {
+        "items": items,
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "max_ms": round(max(times) * 1000, 3),
+    }
+
+async def bench_e2e(repeat: int) -> dict:
+    server = StubServer()
+    await server.start()
+    await executor.start()
+    results = {}
+    try:
+        for name, fn in (
+            ("parse_epravda", epravda_parser.parse_epravda),
+            ("parse_minfin", minfin_parser.parse_minfin),
+            ("parse_coindesk", coindesk_parser.parse_coindesk),
+            ("parse_reuters", reuters_parser.parse_reuters),
+        ):
+            results[name] = await _timed(fn, repeat, cold=True)
+        # run_all: «холодний» прогін (усе качається й розбирається) і «теплий» (304 + кеш розбору)
+        results["run_all_cold"] = await _timed(easy_sources.run_all, repeat, cold=True)
+        results["run_all_warm"] = await _timed(easy_sources.run_all, repeat, cold=False)
+        for name, r in results.items():
+            print(f"• {name}: {r['median_ms']} мс ({r['items']})")
+        results["stub_requests"] = server.requests
+    finally:
+        await http_client.close()
+        await server.stop()
+        executor.shutdown()
+    return results
+
+def _flatten(d: dict, prefix: str = "") -> dict[str, float]:
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            out.update(_flatten(v, key))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+def compare(current: dict, baseline: dict, threshold_pct: float) -> list[str]:
+    # регресія — зростання часу або пікової пам'яті понад поріг
+    cur, base = _flatten(current), _flatten(baseline)
+    regressions = []
+    for key, new in sorted(cur.items()):
+        if not key.endswith(("median_ms", "peak_kib")) or key not in base or not base[key]:
+            continue
+        old = base[key]
+        delta = (new - old) / old * 100
+        mark = "🔴" if delta > threshold_pct else ("🟢" if delta < -threshold_pct else "  ")
+        print(f"{mark} {key}: {old} → {new} ({delta:+.1f}%)")
+        if delta > threshold_pct:
+            regressions.append(key)
+    return regressions
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--out", default=DEFAULT_OUT)
+    ap.add_argument("--baseline")
+    ap.add_argument("--threshold", type=float, default=10.0, help="допуск регресії, %%")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--skip-e2e", action="store_true")
+    ap.add_argument("--items", type=int, default=100_000, help="новин у бенчмарку моделі; 0 — пропустити")
+    ap.add_argument("--stories", type=int, default=5000, help="заголовків у бенчмарку злиття; 0 — пропустити")
+    args = ap.parse_args(argv)
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "parse_executor": executor.PARSE_EXECUTOR,
+            "fixtures": {name: "recorded" if fixtures.recorded(name) else "synthetic" for name in fixtures.FIXTURES},
+        },
+        "parsers": bench_parsers(args.repeat),
+    }
+    if args.items:
+        report["items"] = bench_items(args.items, max(1, args.repeat // 4))
+    if args.stories:
+        report["neardup"] = bench_neardup(args.stories)
+    if not args.skip_e2e:
+        report["e2e"] = asyncio.run(bench_e2e(max(1, args.repeat // 4)))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        metrics = {k: v for k, v in report.items() if k != "meta"}
+        regressions = compare(metrics, {k: v for k, v in baseline.items() if k != "meta"}, args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"❌ Регресій: {len(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
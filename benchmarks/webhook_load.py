@@ -0,0 +1,256 @@
+# benchmarks/webhook_load.py
+"""Навантаження на вебхук bot.build_app з локальним «Telegram Bot API».
+
+    python -m benchmarks.webhook_load [--rate 20] [--duration 10] [--chats 50]
+                                      [--command /news_easy] [--p429 0.05]
+                                      [--redeliver 0.1] [--prefetch] [--out load.json]
+
+Бот, фейковий API і сервер фікстур працюють в одному процесі: мережа до
+сайтів не потрібна, а кожен sendMessage записується з часом надходження.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+TOKEN = "123456:LOADTEST"
+DONE_TEXT = "✅ Готово."
+# відмови черги задач (bot._submit): запит завершено, але без дайджесту
+REJECT_PREFIXES = ("⏳ Зараз забагато", "ℹ️ Цей запит уже")
+
+@dataclass
+class _Request:
+    update_id: int
+    chat_id: int
+    sent_at: float
+    webhook_status: int | None = None
+    webhook_ms: float | None = None
+    first_at: float | None = None
+    done_at: float | None = None
+    error: bool = False
+    rejected: bool = False
+
+class FakeTelegram:
+    """Відповідає на будь-який метод Bot API; sendMessage записує і може віддати 429."""
+
+    def __init__(self, p429: float = 0.0, retry_after: int = 1):
+        self.p429 = p429
+        self.retry_after = retry_after
+        self.calls: list[tuple[float, int, str]] = []
+        self.injected_429 = 0
+        self.on_message = None
+        self._ids = 0
+        self._rng = random.Random(42)
+        self._runner = None
+        self.port = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        data = dict(await request.post()) if request.content_type != "application/json" else await request.json()
+        if method.lower() == "getme":
+            return web.json_response({"ok": True, "result": {
+                "id": 123456, "is_bot": True, "first_name": "Load", "username": "load_bot",
+            }})
+        if method.lower() != "sendmessage":
+            return web.json_response({"ok": True, "result": True})
+
+        if self.p429 and self._rng.random() < self.p429:
+            self.injected_429 += 1
+            return web.json_response({
+                "ok": False, "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }, status=429)
+
+        chat_id = int(data["chat_id"])
+        text = str(data.get("text", ""))
+        now = time.perf_counter()
+        self.calls.append((now, chat_id, text))
+        if self.on_message is not None:
+            self.on_message(now, chat_id, text)
+        self._ids += 1
+        return web.json_response({"ok": True, "result": {
+            "message_id": self._ids, "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"}, "text": text,
+        }})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    v = sorted(values)
+    pick = lambda q: round(v[min(len(v) - 1, int(len(v) * q))] * 1000, 1)
+    return {"count": len(v), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(v[-1] * 1000, 1)}
+
+def _update(update_id: int, chat_id: int, command: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+            "text": command,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(command.split()[0])}],
+        },
+    }
+
+async def run(args) -> dict:
+    fake = FakeTelegram(args.p429)
+    await fake.start()
+
+    # налаштування мають бути в оточенні до імпорту bot
+    os.environ.update({
+        "BOT_TOKEN": TOKEN,
+        "WEBHOOK_URL": "http://127.0.0.1/unused",
+        "TELEGRAM_API_BASE": f"http://127.0.0.1:{fake.port}",
+        "PREFETCH_ENABLED": "1" if args.prefetch else "0",
+        "DIGEST_SLOTS": "",
+    })
+    os.environ.setdefault("NEWS_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="news-load-"), "news.db"))
+    import bot
+    from benchmarks.run import StubServer
+
+    stub = StubServer()
+    await stub.start()
+    runner = web.AppRunner(bot.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}{bot.WEBHOOK_PATH}"
+
+    # відповіді прив'язуються до найстарішого незавершеного запиту цього чату
+    pending: defaultdict[int, deque[_Request]] = defaultdict(deque)
+    requests: list[_Request] = []
+
+    def on_message(at: float, chat_id: int, text: str):
+        queue = pending.get(chat_id)
+        if not queue:
+            return
+        if text.startswith(REJECT_PREFIXES):
+            # відмову отримує щойно надісланий запит, а не той, що вже виконується
+            r = queue.pop()
+            r.rejected = True
+            r.done_at = r.first_at = at
+            return
+        for r in queue:
+            if r.first_at is None:
+                r.first_at = at
+                break
+        if text.startswith("⚠️"):
+            queue[0].error = True
+        if text == DONE_TEXT or text.startswith("⚠️ Сталася помилка"):
+            r = queue.popleft()
+            r.done_at = at
+            r.first_at = r.first_at or at
+
+    fake.on_message = on_message
+
+    async def post(session: ClientSession, r: _Request):
+        t0 = time.perf_counter()
+        try:
+            async with session.post(url, json=_update(r.update_id, r.chat_id, args.command)) as resp:
+                await resp.read()
+                r.webhook_status = resp.status
+        except Exception:
+            r.webhook_status = None
+        r.webhook_ms = (time.perf_counter() - t0) * 1000
+
+    rng = random.Random(7)
+    redelivered: list[_Request] = []
+    started = time.perf_counter()
+    total = int(args.rate * args.duration)
+    async with ClientSession(timeout=ClientTimeout(total=args.webhook_timeout)) as session:
+        tasks = []
+        for i in range(total):
+            # рівномірний темп: не «пачка», а args.rate запитів на секунду
+            delay = started + i / args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            r = _Request(i + 1, 100000 + i % args.chats, time.perf_counter())
+            pending[r.chat_id].append(r)
+            requests.append(r)
+            tasks.append(asyncio.create_task(post(session, r)))
+            if args.redeliver and rng.random() < args.redeliver:
+                # Telegram повторює апдейт з тим самим update_id — відповіді бути не повинно
+                redelivered.append(_Request(r.update_id, r.chat_id, time.perf_counter()))
+                tasks.append(asyncio.create_task(post(session, redelivered[-1])))
+        await asyncio.gather(*tasks)
+
+        deadline = time.perf_counter() + args.drain
+        while any(pending.values()) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+
+    sender_stats = bot.sender.stats()
+    job_stats = bot.jobs.stats()
+    await runner.cleanup()
+    await stub.stop()
+    await fake.stop()
+
+    webhook_errors = sum(1 for r in requests if r.webhook_status != 200)
+    unfinished = sum(1 for r in requests if r.done_at is None)
+    failed = sum(1 for r in requests if r.error or r.done_at is None or r.webhook_status != 200)
+    completed = [r for r in requests if r.done_at and not r.rejected]
+    return {
+        "config": vars(args),
+        "requests": len(requests),
+        "elapsed_sec": round(time.perf_counter() - started, 2),
+        "webhook_response": _percentiles([r.webhook_ms / 1000 for r in requests if r.webhook_ms is not None]),
+        "time_to_first_message": _percentiles([r.first_at - r.sent_at for r in requests if r.first_at]),
+        "time_to_done": _percentiles([r.done_at - r.sent_at for r in completed]),
+        "webhook_errors": webhook_errors,
+        "rejected": sum(1 for r in requests if r.rejected),
+        "redelivered": len(redelivered),
+        "redelivered_dropped": bot.recent_updates.dropped,
+        "unfinished": unfinished,
+        "error_rate": round(failed / len(requests), 4) if requests else 0.0,
+        "send_message_calls": len(fake.calls),
+        "injected_429": fake.injected_429,
+        "sender": sender_stats,
+        "jobs": job_stats,
+    }
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.webhook_load")
+    ap.add_argument("--rate", type=float, default=20.0, help="апдейтів на секунду")
+    ap.add_argument("--duration", type=float, default=10.0, help="секунд навантаження")
+    ap.add_argument("--chats", type=int, default=50)
+    ap.add_argument("--command", default="/news_easy")
+    ap.add_argument("--p429", type=float, default=0.0, help="частка sendMessage, що отримає 429")
+    ap.add_argument("--redeliver", type=float, default=0.0, help="частка апдейтів, доставлених двічі")
+    ap.add_argument("--prefetch", action="store_true", help="увімкнути фоновий знімок")
+    ap.add_argument("--webhook-timeout", type=float, default=60.0, help="скільки Telegram чекає на відповідь вебхука")
+    ap.add_argument("--drain", type=float, default=120.0, help="скільки чекати на «Готово» після навантаження")
+    ap.add_argument("--out")
+    args = ap.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,52 +2,52 @@ import asyncio
 import logging
 import cloudscraper
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+
+from core.browser_pool import pool
 
 logger = logging.getLogger("BloombergParser")
 
-async def fetch_bloomberg(top_n=5):
-    url = "https://www.bloomberg.com/markets"
+URL = "https://www.bloomberg.com/markets"
+ARTICLE_SELECTOR = "a[data-type='article']"
+
+# одна сесія на процес: cookies після Cloudflare-челенджу переживають виклики
+_scraper = None
+
+def _get_scraper():
+    global _scraper
+    if _scraper is None:
+        _scraper = cloudscraper.create_scraper()
+    return _scraper
+
+def _extract(html, top_n):
     articles = []
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.select(ARTICLE_SELECTOR)[:top_n]:
+        title = tag.get_text(strip=True)
+        link = tag.get("href")
+        if link and not link.startswith("http"):
+            link = "https://www.bloomberg.com" + link
+        articles.append({"title": title, "link": link})
+    return articles
 
-    # 1️⃣ cloudscraper first
+async def fetch_bloomberg(top_n=5):
+    # 1️⃣ cloudscraper first (синхронний — у потоці, щоб не блокувати цикл)
     try:
-        scraper = cloudscraper.create_scraper()
-        html = scraper.get(url, timeout=10).text
-        soup = BeautifulSoup(html, "html.parser")
-        for tag in soup.select("a[data-type='article']")[:top_n]:
-            title = tag.get_text(strip=True)
-            link = tag.get("href")
-            if link and not link.startswith("http"):
-                link = "https://www.bloomberg.com" + link
-            articles.append({"title": title, "link": link})
+        html = await asyncio.to_thread(lambda: _get_scraper().get(URL, timeout=10).text)
+        articles = _extract(html, top_n)
         if articles:
             logger.info(f"✅ Bloomberg parsed via cloudscraper ({len(articles)} items)")
             return articles
     except Exception as e:
         logger.warning(f"⚠️ Cloudscraper failed: {e}")
 
-    # 2️⃣ fallback to Playwright
+    # 2️⃣ fallback to Playwright: теплий браузер із пулу
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True, args=["--no-sandbox"])
-            page = await browser.new_page()
-            await page.goto(url, timeout=20000)
-            await asyncio.sleep(3)
-            content = await page.content()
-            await browser.close()
-
-            soup = BeautifulSoup(content, "html.parser")
-            for tag in soup.select("a[data-type='article']")[:top_n]:
-                title = tag.get_text(strip=True)
-                link = tag.get("href")
-                if link and not link.startswith("http"):
-                    link = "https://www.bloomberg.com" + link
-                articles.append({"title": title, "link": link})
-
+        content = await pool.content(URL, ARTICLE_SELECTOR, timeout_ms=20000)
+        articles = _extract(content, top_n)
         logger.info(f"✅ Bloomberg parsed via Playwright ({len(articles)} items)")
         return articles
 
     except Exception as e:
         logger.error(f"❌ Playwright failed: {e}")
-        return []
\ No newline at end of file
+        return []
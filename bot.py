@@ -3,170 +3,459 @@ import os
 import asyncio
 import logging
 import inspect
-from datetime import datetime
+from datetime import date, datetime
 from collections import defaultdict
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List
 
 from aiohttp import web
 from aiogram import Bot, Dispatcher
-from aiogram.filters import CommandStart, Command
-from aiogram.types import Message, LinkPreviewOptions
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import CommandStart, Command, CommandObject
+from aiogram.types import BufferedInputFile, Message
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
 BOT_TOKEN = os.environ.get("BOT_TOKEN", "").strip()
 ADMIN_ID = os.environ.get("ADMIN_ID", "").strip()
 WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "").strip()
+# інший Bot API сервер (локальний telegram-bot-api або стенд навантаження)
+TELEGRAM_API_BASE = os.environ.get("TELEGRAM_API_BASE", "").strip()
 
 assert BOT_TOKEN, "BOT_TOKEN is required"
 assert WEBHOOK_URL, "WEBHOOK_URL is required"
 
 WEBHOOK_PATH = f"/webhook/{BOT_TOKEN}"
-MAX_CHARS_PER_MSG = 3800
-PAUSE_BETWEEN_MSGS_SEC = 0.06
+PREFETCH_ENABLED = os.environ.get("PREFETCH_ENABLED", "1") == "1"
+# живий збір: progressive — блок кожного джерела одразу, як готовий;
+# ordered — один плейсхолдер, що редагується у сталому порядку джерел; batch — усе разом у кінці
+DELIVERY_MODE = os.environ.get("DELIVERY_MODE", "progressive").strip().lower()
+
+from core import tracing
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
+    format="%(asctime)s.%(msecs)03d %(levelname)s [%(trace_id)s] %(name)s: %(message)s",
     datefmt="%H:%M:%S",
 )
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(tracing.TraceIdFilter())
 log = logging.getLogger("news-bot")
 
-# ⬇️ імпортуємо обидві збірки: звичайну і «тільки сьогодні»
+# ⬇️ збірка новин і фоновий «теплий» знімок
 try:
-    from groups.easy_sources import run_all, run_all_today
+    from groups.easy_sources import (
+        run_digest, run_digest_cached, live_results, result_cache, prefetcher, results_for_date,
+    )
 except Exception:
     log.exception("Не вдалося імпортувати groups.easy_sources.*")
     raise
 
-async def _safe_send_many(bot: Bot, chat_id: int, messages: List[str]):
+from core import crawler, executor, feeds, http_client, metrics, page_cache, resilience, workers
+from core.leader import LeaderElection
+from core.profiler import SamplingProfiler
+from core.shared_snapshot import SharedSnapshot
+from core.store import articles
+from groups.engine import ResultStream, Stories, message_chunks, render_messages
+from delivery.packer import TELEGRAM_LIMIT, pack, utf16_len
+from delivery.jobs import JobQueue, RecentUpdates, BUSY, DUPLICATE
+from delivery.sender import SendScheduler, PRIORITY_DIGEST, PRIORITY_STATUS, SEND_GLOBAL_RATE
+from delivery.subscriptions import SubscriptionStore, DigestBroadcaster
+
+async def _safe_send_many(chat_id: int, messages: List[str], priority: int = PRIORITY_DIGEST):
+    chunks = []
     for m in messages:
-        if len(m) <= 4096:
-            await bot.send_message(
-                chat_id,
-                m,
-                link_preview_options=LinkPreviewOptions(is_disabled=True),
-            )
-            await asyncio.sleep(PAUSE_BETWEEN_MSGS_SEC)
+        if utf16_len(m) <= TELEGRAM_LIMIT:
+            chunks.append(m)
             continue
-        start = 0
-        while start < len(m):
-            chunk = m[start:start + MAX_CHARS_PER_MSG]
-            await bot.send_message(
-                chat_id,
-                chunk,
-                link_preview_options=LinkPreviewOptions(is_disabled=True),
-            )
-            start += MAX_CHARS_PER_MSG
-            await asyncio.sleep(PAUSE_BETWEEN_MSGS_SEC)
+        # завеликий текст ріжемо по рядках, а не посеред заголовка чи URL
+        chunks.extend(pack(m.split("\n")))
+    # темп і 429 — на боці sender; тут лише ставимо в чергу і чекаємо доставки
+    with tracing.span("send", messages=len(chunks)):
+        await sender.send_many(chat_id, chunks, priority)
+
+async def _status(chat_id: int, text: str):
+    await sender.send(chat_id, text, PRIORITY_STATUS)
 
 async def _maybe_await(x):
     return await x if inspect.isawaitable(x) else x
 
 dp = Dispatcher()
-bot = Bot(BOT_TOKEN, parse_mode=None)
+bot = Bot(
+    BOT_TOKEN,
+    session=AiohttpSession(api=TelegramAPIServer.from_base(TELEGRAM_API_BASE)) if TELEGRAM_API_BASE else None,
+    parse_mode=None,
+)
+# кілька воркерів: збирає і публікує знімок лише обраний лідер, решта читає його з mmap
+MULTI_WORKER = workers.WEB_WORKERS > 1
+# ліміт Telegram — на бота, а не на процес
+sender = SendScheduler(bot, global_rate=SEND_GLOBAL_RATE / workers.WEB_WORKERS)
+subscriptions = SubscriptionStore()
+jobs = JobQueue()
+recent_updates = RecentUpdates()
+dp.update.outer_middleware(recent_updates)
+
+async def _broadcast_digest() -> list[str]:
+    # один дайджест на слот: зі знімка, інакше — спільний живий збір
+    messages = prefetcher.messages(today_only=False)
+    if messages is None:
+        messages = await run_digest_cached(today_only=False)
+    return messages
+
+broadcaster = DigestBroadcaster(subscriptions, sender, _broadcast_digest)
+
+async def _lead():
+    # пул парсингу, фоновий знімок і розсилка — в одного процесу на розгортання
+    await executor.start()
+    if PREFETCH_ENABLED or MULTI_WORKER:
+        prefetcher.start()
+    broadcaster.start()
+
+election = LeaderElection(_lead)
+if MULTI_WORKER:
+    prefetcher.share(SharedSnapshot())
+
+def _may_scrape() -> bool:
+    return not MULTI_WORKER or election.held
+loop_lag = metrics.LoopLagMonitor()
+
+# наявні лічильники модулів — у /metrics без подвійного обліку
+def _per_source(stats: dict[str, dict], field: str) -> dict[tuple, float]:
+    return {(source,): s[field] for source, s in stats.items()}
+
+def _snapshot_age() -> dict[tuple, float]:
+    snap = prefetcher.snapshot
+    return {(): snap.age} if snap is not None else {}
+
+for _field in ("hits", "misses", "not_modified", "bytes_saved"):
+    metrics.Counter(
+        f"news_page_cache_{_field}_total", f"page_cache {_field}", ("source",),
+        fn=lambda f=_field: _per_source(page_cache.stats(), f),
+    )
+metrics.Counter("news_crawler_pages_total", "Listing pages fetched by the crawler", ("source",),
+                fn=lambda: _per_source(crawler.stats(), "pages"))
+metrics.Counter("news_result_cache_total", "Result cache outcomes", ("outcome",),
+                fn=lambda: {(k,): v for k, v in result_cache.stats().items() if k != "inflight"})
+metrics.Gauge("news_send_queue_depth", "Messages waiting in the send scheduler",
+              fn=lambda: {(): sender.stats()["queue_depth"]})
+metrics.Gauge("news_send_chats_pending", "Chats with queued messages",
+              fn=lambda: {(): sender.stats()["chats_pending"]})
+metrics.Gauge("news_circuit_open", "1 while a source is skipped by its circuit breaker", ("source",),
+              fn=lambda: {(s,): int(b["state"] == "open") for s, b in resilience.stats().items()})
+metrics.Gauge("news_job_queue_depth", "Commands waiting for a job worker",
+              fn=lambda: {(): jobs.stats()["queue_depth"]})
+metrics.Gauge("news_jobs_running", "Commands being executed by job workers",
+              fn=lambda: {(): jobs.running})
+metrics.Counter("news_jobs_rejected_total", "Commands rejected before queueing", ("reason",),
+                fn=lambda: {**{(k,): v for k, v in jobs.rejected.items()}, ("redelivered",): recent_updates.dropped})
+metrics.Gauge("news_snapshot_age_seconds", "Age of the prefetched snapshot", fn=_snapshot_age)
+metrics.Gauge("news_snapshot_version", "Shared snapshot version seen by this worker",
+              fn=lambda: {(): prefetcher.version})
+metrics.Gauge("news_worker_leader", "1 in the worker that scrapes and publishes snapshots",
+              fn=lambda: {(): int(_may_scrape())})
+metrics.Gauge("news_event_loop_lag_last_seconds", "Most recent event loop lag sample",
+              fn=lambda: {(): loop_lag.last})
 
 @dp.message(CommandStart())
 async def cmd_start(message: Message):
-    await message.answer(
+    await _status(
+        message.chat.id,
         "👋 Привіт! Доступні команди:\n"
-        "• /news_easy — Epravda + Minfin + CoinDesk (сьогодні+вчора; без превʼю)\n"
-        "• /news_today — тільки за сьогодні (без превʼю)",
-        link_preview_options=LinkPreviewOptions(is_disabled=True),
+        "• /news_easy — Epravda + Minfin + CoinDesk + Reuters (сьогодні+вчора; без превʼю)\n"
+        "• /news_today — тільки за сьогодні (без превʼю)\n"
+        "• /news_date YYYY-MM-DD — новини за дату з архіву\n"
+        "• /subscribe — щоденний дайджест, /unsubscribe — відписатися",
     )
 
-@dp.message(Command("news_easy"))
-async def cmd_news_easy(message: Message):
-    chat_id = message.chat.id
+async def _edit(chat_id: int, message_id: int, text: str):
     try:
-        await message.answer(
-            "⏳ Збираю свіжі новини... Це може зайняти до 10–20 cекунд.",
-            link_preview_options=LinkPreviewOptions(is_disabled=True),
-        )
+        await sender.edit(chat_id, message_id, text)
+    except TelegramBadRequest as e:
+        # той самий текст удруге — не помилка
+        if "message is not modified" not in str(e).lower():
+            raise
+
+def _progress_text(run: ResultStream) -> str:
+    done = len(run.results)
+    header = f"⏳ Зібрано {done}/{len(run.sources)}; чекаємо: {', '.join(run.pending)}"
+    # перше повідомлення того, що вже є, у сталому порядку; зайве обріжеться по межі новини
+    return pack([header, "\n" + "\n".join(message_chunks(run.ordered))] if done else [header])[0]
+
+async def _deliver_progressive(chat_id: int, run: ResultStream, wait_text: str):
+    try:
+        await _status(chat_id, wait_text)
     except Exception:
         pass
+    # схожі історії з пізніших джерел не дублюємо — вони вже надіслані вище
+    stories = Stories()
+    async for result in run.subscribe():
+        await _safe_send_many(chat_id, render_messages([stories.add(result)]))
+
+async def _deliver_ordered(chat_id: int, run: ResultStream, wait_text: str):
+    placeholder = await sender.send(chat_id, wait_text, PRIORITY_STATUS)
+    seen = 0
+    async for _ in run.subscribe():
+        seen += 1
+        # поки редагували, могли прийти ще результати — показуємо лише останній стан
+        if seen == len(run.results) and not run.done:
+            await _edit(chat_id, placeholder.message_id, _progress_text(run))
+    messages = render_messages(run.ordered)
+    if not messages:
+        await _edit(chat_id, placeholder.message_id, "⚠️ Порожній результат.")
+        return
+    await _edit(chat_id, placeholder.message_id, messages[0])
+    await _safe_send_many(chat_id, messages[1:])
 
+async def _send_digest(message: Message, today_only: bool, wait_text: str, command: str):
+    chat_id = message.chat.id
     try:
-        blocks = await _maybe_await(run_all(today_only=False))
-        if isinstance(blocks, str):
-            blocks = [blocks]
-        if isinstance(blocks, list) and all(isinstance(x, str) for x in blocks):
-            for block in blocks:
-                await _safe_send_many(bot, chat_id, [block])
-            await bot.send_message(
-                chat_id, "✅ Готово.", link_preview_options=LinkPreviewOptions(is_disabled=True)
-            )
+        # теплий знімок відповідає одразу; живий збір — лише якщо він застарів,
+        # і тоді одночасні команди читають один спільний збір
+        messages = prefetcher.messages(today_only)
+        if messages is None and not _may_scrape():
+            # збирає лише лідер: старіший знімок кращий за окремий збір у кожному воркері
+            messages = prefetcher.messages(today_only, max_age_sec=float("inf"))
+            if messages is None:
+                await _status(chat_id, "⏳ Дайджест ще готується — спробуйте за хвилину.")
+                return
+        if messages is None and DELIVERY_MODE != "batch" and not result_cache.cached(("easy", today_only)):
+            run = live_results(today_only)
+            if DELIVERY_MODE == "ordered":
+                await _deliver_ordered(chat_id, run, wait_text)
+            else:
+                await _deliver_progressive(chat_id, run, wait_text)
+            await _status(chat_id, "✅ Готово.")
             return
 
-        await bot.send_message(
-            chat_id, "⚠️ Порожній результат.", link_preview_options=LinkPreviewOptions(is_disabled=True)
-        )
-        await bot.send_message(
-            chat_id, "✅ Готово.", link_preview_options=LinkPreviewOptions(is_disabled=True)
-        )
+        if messages is None:
+            if not result_cache.cached(("easy", today_only)):
+                try:
+                    await _status(chat_id, wait_text)
+                except Exception:
+                    pass
+            messages = await _maybe_await(run_digest_cached(today_only=today_only))
+
+        if isinstance(messages, str):
+            messages = [messages]
+        if isinstance(messages, list) and all(isinstance(x, str) for x in messages):
+            await _safe_send_many(chat_id, messages)
+            await _status(chat_id, "✅ Готово.")
+            return
+
+        await _status(chat_id, "⚠️ Порожній результат.")
+        await _status(chat_id, "✅ Готово.")
 
     except Exception as e:
-        log.exception("Помилка у /news_easy: %s", e)
+        log.exception("Помилка у /%s: %s", command, e)
         try:
-            await bot.send_message(
-                chat_id,
-                "⚠️ Сталася помилка під час формування списку новин.",
-                link_preview_options=LinkPreviewOptions(is_disabled=True),
-            )
+            await _status(chat_id, "⚠️ Сталася помилка під час формування списку новин.")
         except Exception:
             pass
 
+async def _submit(message: Message, command: str, run: Callable[[], Awaitable[Any]], *args,
+                  traced: bool = True):
+    # вебхук не чекає на збір: задача йде в обмежену чергу, воркер виконає її пізніше
+    async def job():
+        if not traced:
+            return await run()
+        with metrics.command_seconds.time(command), tracing.trace(command):
+            await run()
+
+    outcome = jobs.submit((message.chat.id, command, *args), job)
+    if outcome == BUSY:
+        await _status(message.chat.id, "⏳ Зараз забагато запитів — спробуйте за хвилину.")
+    elif outcome == DUPLICATE:
+        await _status(message.chat.id, "ℹ️ Цей запит уже виконується — дочекайтеся відповіді.")
+
+@dp.message(Command("news_easy"))
+async def cmd_news_easy(message: Message):
+    await _submit(message, "news_easy", lambda: _send_digest(
+        message,
+        today_only=False,
+        wait_text="⏳ Збираю свіжі новини... Це може зайняти до 10–20 cекунд.",
+        command="news_easy",
+    ))
+
 @dp.message(Command("news_today"))
 async def cmd_news_today(message: Message):
+    await _submit(message, "news_today", lambda: _send_digest(
+        message,
+        today_only=True,
+        wait_text="⏳ Збираю новини за сьогодні... Це може зайняти до 10–20 cекунд.",
+        command="news_today",
+    ))
+
+@dp.message(Command("news_date"))
+async def cmd_news_date(message: Message, command: CommandObject):
+    await _submit(message, "news_date", lambda: _news_date(message, command), (command.args or "").strip())
+
+async def _news_date(message: Message, command: CommandObject):
     chat_id = message.chat.id
+    arg = (command.args or "").strip()
     try:
-        await message.answer(
-            "⏳ Збираю новини за сьогодні... Це може зайняти до 10–20 cекунд.",
-            link_preview_options=LinkPreviewOptions(is_disabled=True),
+        day = date.fromisoformat(arg).isoformat()
+    except ValueError:
+        await _status(
+            chat_id,
+            "ℹ️ Формат: /news_date YYYY-MM-DD (наприклад, /news_date 2025-01-31)",
         )
-    except Exception:
-        pass
+        return
 
     try:
-        blocks = await _maybe_await(run_all_today())
-        if isinstance(blocks, str):
-            blocks = [blocks]
-        if isinstance(blocks, list) and all(isinstance(x, str) for x in blocks):
-            for block in blocks:
-                await _safe_send_many(bot, chat_id, [block])
-            await bot.send_message(
-                chat_id, "✅ Готово.", link_preview_options=LinkPreviewOptions(is_disabled=True)
-            )
+        results = await results_for_date(day)
+        if not any(r.items for r in results):
+            await _status(chat_id, f"📭 За {day} в архіві нічого немає.")
             return
-
-        await bot.send_message(
-            chat_id, "⚠️ Порожній результат.", link_preview_options=LinkPreviewOptions(is_disabled=True)
-        )
-        await bot.send_message(
-            chat_id, "✅ Готово.", link_preview_options=LinkPreviewOptions(is_disabled=True)
-        )
-
+        await _safe_send_many(chat_id, render_messages([r for r in results if r.items]))
+        await _status(chat_id, "✅ Готово.")
     except Exception as e:
-        log.exception("Помилка у /news_today: %s", e)
+        log.exception("Помилка у /news_date: %s", e)
         try:
-            await bot.send_message(
-                chat_id,
-                "⚠️ Сталася помилка під час формування списку новин.",
-                link_preview_options=LinkPreviewOptions(is_disabled=True),
-            )
+            await _status(chat_id, "⚠️ Сталася помилка під час читання архіву.")
         except Exception:
             pass
 
+@dp.message(Command("subscribe"))
+async def cmd_subscribe(message: Message):
+    added = await asyncio.to_thread(subscriptions.add, message.chat.id)
+    slots = ", ".join(t.strftime("%H:%M") for t in broadcaster.slots) or "—"
+    await _status(
+        message.chat.id,
+        f"🔔 Підписку оформлено. Дайджест приходитиме о {slots} (Київ)."
+        if added else "ℹ️ Ви вже підписані.",
+    )
+
+@dp.message(Command("unsubscribe"))
+async def cmd_unsubscribe(message: Message):
+    removed = await asyncio.to_thread(subscriptions.remove, message.chat.id)
+    await _status(
+        message.chat.id,
+        "🔕 Підписку скасовано." if removed else "ℹ️ Ви не були підписані.",
+    )
+
+def _is_admin(message: Message) -> bool:
+    return bool(ADMIN_ID) and message.from_user is not None and str(message.from_user.id) == ADMIN_ID
+
+@dp.message(Command("profile"))
+async def cmd_profile(message: Message, command: CommandObject):
+    # лише для ADMIN_ID; решті — ніби команди не існує
+    if not _is_admin(message):
+        return
+    if not _may_scrape():
+        # повний збір — лише в лідері; вебхук ляже в довільний воркер, тож можна повторити
+        await _status(
+            message.chat.id,
+            f"ℹ️ Цей воркер (pid {os.getpid()}) новини не збирає — профілювання лише в лідері. "
+            "Надішліть /profile ще раз.",
+        )
+        return
+    # власне трасування з таймлайном — усередині _profile
+    await _submit(message, "profile", lambda: _profile(message, command), traced=False)
+
+async def _profile(message: Message, command: CommandObject):
+    chat_id = message.chat.id
+    cold = (command.args or "").strip() == "cold"
+    if cold:
+        # без валідаторів і кешу розбору — як перший збір після старту
+        page_cache.clear()
+        feeds.clear()
+    await _status(chat_id, "🧪 Профілюю один повний збір" + (" (холодний кеш)" if cold else "") + "...")
+
+    profiler = SamplingProfiler()
+    try:
+        with tracing.trace("profile") as t, profiler:
+            messages = await run_digest(today_only=False)
+    except Exception as e:
+        log.exception("Помилка у /profile: %s", e)
+        await _status(chat_id, f"⚠️ Збір упав: {e}")
+        return
+
+    report = "\n".join([
+        f"/profile {datetime.now():%Y-%m-%d %H:%M:%S}" + (" cold" if cold else ""),
+        f"пул парсингу: {type(executor.get()).__name__} (у процесах розбір не семплюється)",
+        f"повідомлень у дайджесті: {len(messages)}",
+        "",
+        t.timeline(),
+        "",
+        profiler.report(),
+    ])
+    await bot.send_document(
+        chat_id,
+        BufferedInputFile(report.encode("utf-8"), filename=f"profile-{t.trace_id}.txt"),
+        caption=f"⏱ {t.elapsed:.1f} с, trace {t.trace_id}",
+    )
+
 async def health(_):
-    return web.json_response({"status": "alive"})
+    prefetcher.sync()
+    return web.json_response({
+        "status": "alive",
+        "page_cache": page_cache.stats(),
+        "crawler": crawler.stats(),
+        "feeds": feeds.stats(),
+        "sources": resilience.stats(),
+        "result_cache": result_cache.stats(),
+        "jobs": jobs.stats(),
+        "sender": sender.stats(),
+        "broadcast": broadcaster.stats(),
+        "worker": {
+            "pid": os.getpid(),
+            "role": "leader" if _may_scrape() else "follower",
+            "snapshot": prefetcher.shared.stats() if prefetcher.shared is not None else None,
+        },
+    })
+
+async def metrics_endpoint(_):
+    return web.Response(
+        body=metrics.render().encode("utf-8"),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
+
+async def _on_startup(_app: web.Application):
+    loop_lag.start()
+    if not MULTI_WORKER:
+        # єдиний процес — сам собі лідер
+        await _lead()
+    await http_client.start()
+    sender.start()
+    jobs.start()
+    if MULTI_WORKER:
+        election.start()
+
+async def _on_cleanup(_app: web.Application):
+    await election.stop()
+    await broadcaster.stop()
+    await prefetcher.stop()
+    await jobs.stop()
+    await sender.stop()
+    await http_client.close()
+    executor.shutdown()
+    articles.close()
+    subscriptions.close()
+    await loop_lag.stop()
 
 def build_app() -> web.Application:
     app = web.Application()
+    app.on_startup.append(_on_startup)
+    app.on_cleanup.append(_on_cleanup)
     app.router.add_get("/health", health)
-    SimpleRequestHandler(dispatcher=dp, bot=bot).register(app, path=WEBHOOK_PATH)
+    app.router.add_get("/metrics", metrics_endpoint)
+    # відповідь Telegram — одразу; сам обробник лише ставить задачу в jobs
+    SimpleRequestHandler(dispatcher=dp, bot=bot, handle_in_background=True).register(app, path=WEBHOOK_PATH)
     setup_application(app, dp, bot=bot)
     return app
 
 app = build_app()
 
+HOST = "0.0.0.0"
+PORT = int(os.environ.get("PORT", "10000"))
+
+def _run_worker(index: int):
+    # усі воркери слухають один порт; ядро розподіляє з'єднання між ними
+    log.info("Воркер %d (pid %s) на порту %s", index, os.getpid(), PORT)
+    web.run_app(app, host=HOST, port=PORT, reuse_port=True, print=None)
+
 if __name__ == "__main__":
-    web.run_app(app, host="0.0.0.0", port=int(os.environ.get("PORT", "10000")))
\ No newline at end of file
+    if MULTI_WORKER:
+        workers.serve(_run_worker)
+    else:
+        web.run_app(app, host=HOST, port=PORT)
\ No newline at end of file
@@ -0,0 +1,180 @@
+# core/browser_pool.py
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+log = logging.getLogger("news-bot.browser_pool")
+
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", "2"))
+# після стількох сторінок або при такому RSS браузер перезапускається
+BROWSER_MAX_PAGES = int(os.environ.get("BROWSER_MAX_PAGES", "50"))
+BROWSER_MAX_RSS_MB = int(os.environ.get("BROWSER_MAX_RSS_MB", "800"))
+
+# для витягання посилань вистачає DOM — решту навіть не качаємо
+BLOCKED_RESOURCES = frozenset({"image", "font", "stylesheet", "media"})
+
+_CHROME_NAMES = ("chrome", "chromium", "headless_shell")
+
+def _browser_rss_mb() -> float:
+    # сумарний RSS процесів Chromium-нащадків цього процесу (Linux /proc)
+    parents: dict[int, int] = {}
+    names: dict[int, str] = {}
+    rss: dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                for line in f:
+                    if line.startswith("Name:"):
+                        names[int(entry)] = line.split(None, 1)[1].strip().lower()
+                    elif line.startswith("PPid:"):
+                        parents[int(entry)] = int(line.split()[1])
+                    elif line.startswith("VmRSS:"):
+                        rss[int(entry)] = int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+
+    me = os.getpid()
+    total_kb = 0
+    for pid, name in names.items():
+        if not any(n in name for n in _CHROME_NAMES):
+            continue
+        p, hops = parents.get(pid), 0
+        while p and p != me and hops < 16:
+            p, hops = parents.get(p), hops + 1
+        if p == me:
+            total_kb += rss.get(pid, 0)
+    return total_kb / 1024
+
+async def _block_heavy(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class BrowserPool:
+    """Один теплий Chromium на процес; сторінки видаються з обмеженого пулу контекстів."""
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_pages: int = BROWSER_MAX_PAGES,
+                 max_rss_mb: int = BROWSER_MAX_RSS_MB):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._pw = None
+        self._browser = None
+        self._idle: list = []
+        self._active = 0
+        self._served = 0
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(size)
+        self.launches = 0
+        self.recycles = 0
+
+    async def _launch(self):
+        if self._pw is None:
+            self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=True, args=["--no-sandbox"])
+        self._served = 0
+        self.launches += 1
+        log.info("Chromium запущено (#%d)", self.launches)
+
+    def _worn_out(self) -> bool:
+        if self._served >= self.max_pages:
+            return True
+        try:
+            return _browser_rss_mb() > self.max_rss_mb
+        except OSError:
+            return False
+
+    async def _close_browser(self):
+        idle, self._idle = self._idle, []
+        for ctx in idle:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                log.warning("Не вдалося закрити Chromium: %s", e)
+
+    async def _acquire_context(self):
+        async with self._lock:
+            # перезапуск лише коли ніхто не тримає сторінку
+            if self._browser is not None and self._active == 0 and self._worn_out():
+                self.recycles += 1
+                log.info("Перезапуск Chromium після %d сторінок", self._served)
+                await self._close_browser()
+            if self._browser is None or not self._browser.is_connected():
+                self._idle.clear()
+                await self._launch()
+            if self._idle:
+                ctx = self._idle.pop()
+            else:
+                ctx = await self._browser.new_context()
+                await ctx.route("**/*", _block_heavy)
+            self._active += 1
+            return self._browser, ctx
+
+    async def _release_context(self, browser, ctx):
+        async with self._lock:
+            self._active -= 1
+            self._served += 1
+            if browser is self._browser and len(self._idle) < self.size:
+                self._idle.append(ctx)
+                return
+        try:
+            await ctx.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._slots:
+            browser, ctx = await self._acquire_context()
+            page = None
+            try:
+                page = await ctx.new_page()
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await self._release_context(browser, ctx)
+
+    async def content(self, url: str, selector: str, timeout_ms: int = 20000) -> str:
+        # чекаємо на потрібний елемент, а не фіксовану паузу
+        async with self.page() as page:
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            try:
+                await page.wait_for_selector(selector, timeout=timeout_ms)
+            except PlaywrightTimeoutError:
+                log.warning("Не дочекались %s на %s", selector, url)
+            return await page.content()
+
+    async def close(self):
+        async with self._lock:
+            await self._close_browser()
+            if self._pw is not None:
+                await self._pw.stop()
+                self._pw = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._browser is not None,
+            "active": self._active,
+            "idle_contexts": len(self._idle),
+            "pages_since_launch": self._served,
+            "launches": self.launches,
+            "recycles": self.recycles,
+        }
+
+pool = BrowserPool()
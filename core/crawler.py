@@ -0,0 +1,108 @@
+# core/crawler.py
+import os
+import re
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from html import unescape
+from typing import AsyncIterator, Callable, Hashable
+from urllib.parse import urljoin
+
+from core import page_cache
+from core.items import NewsItem
+
+log = logging.getLogger("news-bot.crawler")
+
+CRAWL_MAX_PAGES = int(os.environ.get("CRAWL_MAX_PAGES", "5"))
+
+# <link rel="next" href=...> / <a rel="next" ...> або посилання пагінації з класом next
+_TAG_RE = re.compile(rb"<(?:link|a)\b[^>]*>", re.I)
+_REL_NEXT_RE = re.compile(rb"""\brel\s*=\s*["']?[^"'>]*\bnext\b""", re.I)
+_CLASS_NEXT_RE = re.compile(rb"""\bclass\s*=\s*["'][^"']*\b(?:next|pagination__next|page-next)\b""", re.I)
+_HREF_RE = re.compile(rb"""\bhref\s*=\s*["']([^"']+)["']""", re.I)
+
+class PageItems(list):
+    """Новини сторінки; skipped — (url, ординал дня) рядків, які екстрактор
+    свідомо не розбирав (напр. уже відомі з інших розділів)."""
+
+    def __init__(self, items=(), skipped=()):
+        super().__init__(items)
+        self.skipped: list[tuple[str, int]] = list(skipped)
+
+@dataclass
+class CrawlStats:
+    crawls: int = 0
+    pages: int = 0
+    last_pages: int = 0
+    stopped_by_date: int = 0
+    stopped_by_cap: int = 0
+
+_stats: defaultdict[str, CrawlStats] = defaultdict(CrawlStats)
+
+def max_pages_for(source: str) -> int:
+    return int(os.environ.get(f"CRAWL_MAX_PAGES_{source.upper()}", CRAWL_MAX_PAGES))
+
+def find_next_url(html: bytes, base: str) -> str | None:
+    # дешевий пошук по сирих байтах, без побудови дерева
+    for pattern in (_REL_NEXT_RE, _CLASS_NEXT_RE):
+        for tag in _TAG_RE.finditer(html):
+            t = tag.group(0)
+            if pattern.search(t):
+                href = _HREF_RE.search(t)
+                if href:
+                    url = urljoin(base, unescape(href.group(1).decode("utf-8", "replace")))
+                    if url.rstrip("/") != base.rstrip("/"):
+                        return url
+    return None
+
+async def crawl(start_url: str, fn: Callable, *args, source: str, oldest: int,
+                headers: dict | None = None, max_pages: int | None = None,
+                first_page: page_cache.Page | None = None,
+                variant: Hashable = None) -> AsyncIterator[list[NewsItem]]:
+    """Сторінки стрічки по черзі, поки не трапиться новина, старша за oldest (ординал дня)."""
+    max_pages = max_pages or max_pages_for(source)
+    stats = _stats[source]
+    stats.crawls += 1
+    fetched = 0
+    url, seen = start_url, set()
+    try:
+        while url and url not in seen:
+            seen.add(url)
+            if fetched == 0 and first_page is not None:
+                page = first_page
+            else:
+                try:
+                    page = await page_cache.fetch(url, source=source, headers=headers)
+                except Exception as e:
+                    if fetched == 0:
+                        raise
+                    # наступна сторінка — бонус; її збій не зіпсує вже зібране
+                    log.warning("Пагінація %s обірвалась на %s: %s", source, url, e)
+                    return
+            fetched += 1
+            items = await page_cache.extract(page, fn, *args, variant=variant)
+            yield items
+
+            # пропущені рядки теж рахуються: сторінка, де все вже відоме, не порожня
+            days = [n.day for n in items]
+            days.extend(day for _, day in getattr(items, "skipped", ()))
+            if not days or min(days) < oldest:
+                stats.stopped_by_date += 1
+                return
+            if fetched >= max_pages:
+                stats.stopped_by_cap += 1
+                return
+            url = find_next_url(page.body, page.url)
+    finally:
+        stats.pages += fetched
+        stats.last_pages = fetched
+
+def stats() -> dict[str, dict]:
+    return {source: asdict(s) for source, s in _stats.items()}
+
+async def crawl_items(start_url: str, fn: Callable, *args, **kwargs) -> PageItems:
+    items = PageItems()
+    async for page_items in crawl(start_url, fn, *args, **kwargs):
+        items.extend(page_items)
+        items.skipped.extend(getattr(page_items, "skipped", ()))
+    return items
@@ -0,0 +1,23 @@
+# core/dates.py
+from datetime import date
+
+from core import metrics, tracing
+from core.items import NewsItem
+
+def allowed_dates(today_only: bool = False) -> set[int]:
+    # ординали днів (date.toordinal), як у NewsItem.day
+    today = date.today().toordinal()
+    return {today} if today_only else {today, today - 1}
+
+def filter_by_date(items: list[NewsItem], today_only: bool = False,
+                   source: str | None = None) -> list[NewsItem]:
+    allowed = allowed_dates(today_only)
+    with tracing.span("filter", source=source or "-"):
+        kept = [n for n in items if n.day in allowed]
+    if source is not None and len(kept) < len(items):
+        metrics.items_dropped.inc(source, "date", amount=len(items) - len(kept))
+    return kept
+
+def oldest_date(today_only: bool = False) -> int:
+    # нижня межа вікна: все, що старше, вже не потрібне
+    return min(allowed_dates(today_only))
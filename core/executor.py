@@ -0,0 +1,68 @@
+# core/executor.py
+import os
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+log = logging.getLogger("news-bot.executor")
+
+# process | thread
+PARSE_EXECUTOR = os.environ.get("PARSE_EXECUTOR", "process").strip().lower()
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+_executor: Executor | None = None
+
+def _ping() -> int:
+    return os.getpid()
+
+def _thread_pool() -> Executor:
+    return ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+def _create() -> Executor:
+    if PARSE_EXECUTOR == "process":
+        try:
+            return ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        except (OSError, ImportError, NotImplementedError) as e:
+            # напр. середовища без POSIX-семафорів
+            log.warning("ProcessPool недоступний (%s) — парсимо в потоках", e)
+    return _thread_pool()
+
+def get() -> Executor:
+    global _executor
+    if _executor is None:
+        _executor = _create()
+    return _executor
+
+async def start() -> Executor:
+    # прогріваємо пул на старті, поки в процесі ще немає сторонніх потоків
+    ex = get()
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(ex, _ping)
+    except BrokenProcessPool:
+        _fallback_to_threads()
+    log.info("Пул парсингу: %s × %s", type(get()).__name__, PARSE_WORKERS)
+    return get()
+
+def _fallback_to_threads():
+    global _executor
+    broken, _executor = _executor, _thread_pool()
+    log.warning("Пул процесів зламався — переходимо на потоки")
+    if broken is not None:
+        broken.shutdown(wait=False, cancel_futures=True)
+
+def shutdown():
+    global _executor
+    ex, _executor = _executor, None
+    if ex is not None:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+async def run(fn, *args):
+    """Виконує fn(*args) у пулі парсингу; fn і аргументи мають бути picklable."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get(), fn, *args)
+    except BrokenProcessPool:
+        _fallback_to_threads()
+        return await loop.run_in_executor(get(), fn, *args)
@@ -0,0 +1,201 @@
+# core/feeds.py
+import os
+import time
+import logging
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+from core import http_client, metrics, resilience, tracing
+from core.items import NewsItem
+
+log = logging.getLogger("news-bot.feeds")
+
+FEED_TOP_N = int(os.environ.get("FEED_TOP_N", "30"))
+CHUNK_SIZE = 16 * 1024
+
+_ITEM_TAGS = ("item", "entry")            # RSS / Atom
+_DATE_TAGS = ("pubDate", "published", "updated", "date")
+
+@dataclass
+class _Feed:
+    etag: str | None
+    last_modified: str | None
+    items: list[NewsItem]
+
+@dataclass
+class FeedStats:
+    fetches: int = 0
+    not_modified: int = 0
+    bytes_read: int = 0
+    stopped_early: int = 0   # тіло дочитувати не довелося
+    unexpected_304: int = 0  # 304, хоча збереженої копії немає — запит повторено безумовно
+
+_feeds: dict[str, _Feed] = {}
+_stats: defaultdict[str, FeedStats] = defaultdict(FeedStats)
+
+def _local(tag: str) -> str:
+    # "{http://www.w3.org/2005/Atom}entry" -> "entry"
+    return tag.rsplit("}", 1)[-1]
+
+def _parse_date(text: str | None) -> date | None:
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        dt = parsedate_to_datetime(text)          # RFC 822 (RSS pubDate)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))  # RFC 3339 (Atom)
+        except ValueError:
+            return None
+    # у місцевий день, як і date.today() у core.dates
+    return dt.astimezone().date() if dt.tzinfo else dt.date()
+
+def _item(elem: ET.Element, label: str, section: str) -> NewsItem | None:
+    title = link = published = None
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "title":
+            title = (child.text or "").strip()
+        elif tag == "link":
+            # Atom: <link href=... rel="alternate"/>, RSS: <link>url</link>
+            href = child.get("href")
+            if href is None:
+                link = link or (child.text or "").strip()
+            elif child.get("rel", "alternate") == "alternate":
+                link = href.strip()
+        elif tag in _DATE_TAGS and published is None:
+            published = _parse_date(child.text)
+    if not title or not link or published is None:
+        return None
+    return NewsItem.new(title, link, published, label, section)
+
+class FeedReader:
+    """Інкрементальний розбір RSS/Atom: елементи звільняються одразу після обробки."""
+
+    def __init__(self, label: str, section: str, oldest: int | None = None,
+                 top_n: int = FEED_TOP_N, ordered: bool = True):
+        self.label = label
+        self.section = section
+        self.oldest = oldest
+        self.top_n = top_n
+        # ordered: стрічка від нових до старих, тож перша стара новина — кінець вікна
+        self.ordered = ordered
+        self.items: list[NewsItem] = []
+        self.done = False
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: list[ET.Element] = []
+
+    def feed(self, chunk: bytes):
+        if self.done:
+            return
+        self._parser.feed(chunk)
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+            self._stack.pop()
+            if _local(elem.tag) not in _ITEM_TAGS:
+                continue
+            item = _item(elem, self.label, self.section)
+            # звільняємо пам'ять: і вміст, і сам вузол у батька
+            elem.clear()
+            if self._stack:
+                self._stack[-1].remove(elem)
+            if item is None:
+                continue
+            if self.oldest and item.day < self.oldest:
+                if self.ordered:
+                    self.done = True
+                    return
+                continue
+            self.items.append(item)
+            if len(self.items) >= self.top_n:
+                self.done = True
+                return
+
+    def close(self) -> list[NewsItem]:
+        if not self.done:
+            self._parser.close()
+        return self.items
+
+def parse_feed(xml: bytes | str, label: str, section: str, **kwargs) -> list[NewsItem]:
+    reader = FeedReader(label, section, **kwargs)
+    reader.feed(xml.encode() if isinstance(xml, str) else xml)
+    return reader.close()
+
+async def fetch_feed(url: str, *, source: str, label: str, section: str,
+                     oldest: int | None = None, top_n: int = FEED_TOP_N, ordered: bool = True,
+                     headers: dict | None = None) -> list[NewsItem]:
+    prev = _feeds.get(url)
+    stats = _stats[source]
+    req_headers = dict(headers or {})
+    if prev is not None:
+        if prev.etag:
+            req_headers["If-None-Match"] = prev.etag
+        if prev.last_modified:
+            req_headers["If-Modified-Since"] = prev.last_modified
+
+    async def read(unconditional: bool = False) -> list[NewsItem]:
+        stats.fetches += 1
+        # безумовний повтор: без наших валідаторів і повз проміжні кеші
+        send_headers = {**(headers or {}), "Cache-Control": "no-cache"} if unconditional else req_headers
+        async with http_client.stream(url, headers=send_headers) as resp:
+            metrics.http_responses.inc(source, resp.status)
+            if resp.status == 304 and prev is not None and not unconditional:
+                stats.not_modified += 1
+                return prev.items
+            if resp.status != 304:
+                reader = FeedReader(label, section, oldest, top_n, ordered)
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                    stats.bytes_read += len(chunk)
+                    metrics.bytes_downloaded.inc(source, amount=len(chunk))
+                    reader.feed(chunk)
+                    if reader.done:
+                        # решту тіла не читаємо: з'єднання просто закриється
+                        stats.stopped_early += 1
+                        break
+                items = reader.close()
+                _feeds[url] = _Feed(resp.headers.get("ETag"), resp.headers.get("Last-Modified"), items)
+                return items
+        # 304, а тіла, з яким порівнювали, немає (кеш витіснено, рестарт, валідатор
+        # проміжного кешу): порожній розбір став би збоєм джерела
+        if not unconditional:
+            stats.unexpected_304 += 1
+            log.info("%s: 304 без збереженої копії %s — повторюємо безумовно", source, url)
+            return await read(unconditional=True)
+        log.warning("%s: 304 і на безумовний запит %s — стрічку пропущено", source, url)
+        return []
+
+    t0 = time.perf_counter()
+    # розбір іде потоково, тож цей етап — і завантаження, і парсинг
+    with tracing.span("fetch", source=source, url=url):
+        try:
+            # без хеджування: два потокові читання однієї стрічки нічого не дають
+            items = await resilience.call(source, read, hedge=False)
+        except aiohttp.ClientResponseError as e:
+            metrics.http_responses.inc(source, e.status)
+            raise
+        except Exception:
+            metrics.http_responses.inc(source, "error")
+            raise
+        finally:
+            metrics.fetch_seconds.observe(time.perf_counter() - t0, source)
+    metrics.items_extracted.inc(source, amount=len(items))
+
+    if oldest:
+        # збережений після 304 список міг бути зібраний для ширшого вікна
+        items = [n for n in items if n.day >= oldest]
+    return items
+
+def stats() -> dict[str, dict]:
+    return {source: asdict(s) for source, s in _stats.items()}
+
+def clear():
+    _feeds.clear()
+    _stats.clear()
@@ -0,0 +1,122 @@
+# core/html_backends.py
+import os
+import re
+import logging
+from typing import Callable, Iterable
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import UnicodeDammit
+
+log = logging.getLogger("news-bot.html")
+
+# еталонна поведінка: саме так парсили сторінки до появи бекендів
+REFERENCE_BACKEND = "html.parser"
+BACKENDS = ("html.parser", "lxml", "selectolax")
+
+# Subtree = (тег або None, атрибути) у дусі SoupStrainer
+Subtree = tuple[str | None, dict]
+
+def _available(name: str) -> bool:
+    try:
+        if name == "lxml":
+            import lxml  # noqa: F401
+        elif name == "selectolax":
+            from selectolax.lexbor import LexborHTMLParser  # noqa: F401
+        elif name != REFERENCE_BACKEND:
+            return False
+    except ImportError:
+        return False
+    return True
+
+_resolved: dict[str, str] = {}
+
+def backend_for(source: str) -> str:
+    # HTML_BACKEND_<SOURCE> > HTML_BACKEND > еталонний html.parser
+    if source in _resolved:
+        return _resolved[source]
+    name = (
+        os.environ.get(f"HTML_BACKEND_{source.upper()}")
+        or os.environ.get("HTML_BACKEND")
+        or REFERENCE_BACKEND
+    ).strip().lower()
+    if not _available(name):
+        log.warning("HTML-бекенд %r недоступний для %s — використовуємо %s", name, source, REFERENCE_BACKEND)
+        name = REFERENCE_BACKEND
+    _resolved[source] = name
+    return name
+
+class Node:
+    """Мінімальний спільний інтерфейс вузла поверх bs4 і selectolax."""
+
+    __slots__ = ("_n", "_lexbor")
+
+    def __init__(self, node, lexbor: bool):
+        self._n = node
+        self._lexbor = lexbor
+
+    def select(self, css: str) -> list["Node"]:
+        found = self._n.css(css) if self._lexbor else self._n.select(css)
+        return [Node(n, self._lexbor) for n in found]
+
+    def select_one(self, css: str) -> "Node | None":
+        n = self._n.css_first(css) if self._lexbor else self._n.select_one(css)
+        return Node(n, self._lexbor) if n is not None else None
+
+    def find_first(self, tags: Iterable[str]) -> "Node | None":
+        tags = list(tags)
+        n = self._n.css_first(", ".join(tags)) if self._lexbor else self._n.find(tags)
+        return Node(n, self._lexbor) if n is not None else None
+
+    def text(self) -> str:
+        # еквівалент get_text(strip=True)
+        if self._lexbor:
+            return self._n.text(deep=True, separator="", strip=True)
+        return self._n.get_text(strip=True)
+
+    def get(self, attr: str, default: str = "") -> str:
+        if self._lexbor:
+            value = self._n.attributes.get(attr)
+        else:
+            value = self._n.get(attr)
+            if isinstance(value, list):  # bs4 повертає class як список
+                value = " ".join(value)
+        return default if value is None else value
+
+    @property
+    def parent(self) -> "Node | None":
+        n = self._n.parent
+        return Node(n, self._lexbor) if n is not None else None
+
+def _decode(html: bytes | str) -> str:
+    if isinstance(html, str):
+        return html
+    return UnicodeDammit(html, is_html=True).unicode_markup
+
+def _strainer(subtree: Subtree) -> SoupStrainer:
+    tag, attrs = subtree
+    attrs = dict(attrs)
+    cls = attrs.get("class")
+    if isinstance(cls, str):
+        # SoupStrainer порівнює class цілим рядком; нам треба як у CSS (.item)
+        attrs["class"] = re.compile(rf"(^|\s){re.escape(cls)}(\s|$)")
+    return SoupStrainer(tag, attrs=attrs)
+
+def parse(html: bytes | str, backend: str = REFERENCE_BACKEND, subtree: Subtree | None = None) -> Node:
+    # однакове декодування для всіх бекендів, щоб вони бачили той самий текст
+    text = _decode(html)
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        # lexbor розбирає весь документ достатньо швидко; subtree тут не потрібен
+        return Node(LexborHTMLParser(text).root, lexbor=True)
+    strainer = _strainer(subtree) if subtree else None
+    return Node(BeautifulSoup(text, backend, parse_only=strainer), lexbor=False)
+
+def compare_backends(extract: Callable, html: bytes, *args) -> dict[str, bool]:
+    # чи видає кожен доступний бекенд (із subtree) те саме, що html.parser по всій сторінці;
+    # екстрактор приймає subtree=None — розбір без SoupStrainer
+    reference = extract(html, *args, backend=REFERENCE_BACKEND, subtree=None)
+    return {
+        name: extract(html, *args, backend=name) == reference
+        for name in BACKENDS
+        if _available(name)
+    }
@@ -0,0 +1,96 @@
+# core/http_client.py
+import os
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Mapping, NamedTuple
+
+import aiohttp
+from aiohttp.compression_utils import HAS_BROTLI
+
+log = logging.getLogger("news-bot.http")
+
+CONNECT_TIMEOUT_SEC = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT_SEC = float(os.environ.get("HTTP_READ_TIMEOUT", "15"))
+TOTAL_TIMEOUT_SEC = float(os.environ.get("HTTP_TOTAL_TIMEOUT", "20"))
+LIMIT_TOTAL = int(os.environ.get("HTTP_LIMIT", "32"))
+LIMIT_PER_HOST = int(os.environ.get("HTTP_LIMIT_PER_HOST", "4"))
+DNS_TTL_SEC = int(os.environ.get("HTTP_DNS_TTL", "300"))
+KEEPALIVE_SEC = float(os.environ.get("HTTP_KEEPALIVE", "60"))
+
+# br віддаємо лише якщо aiohttp вміє його розпакувати (пакет Brotli)
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+class Response(NamedTuple):
+    status: int
+    headers: Mapping[str, str]  # CIMultiDict: регістр ключів не важливий
+    body: bytes
+
+_session: aiohttp.ClientSession | None = None
+# стенди (benchmarks/) перенаправляють запити на локальний сервер
+_url_rewrite: Callable[[str], str] | None = None
+
+def set_url_rewrite(fn: Callable[[str], str] | None):
+    global _url_rewrite
+    _url_rewrite = fn
+
+def _url(url: str) -> str:
+    return _url_rewrite(url) if _url_rewrite is not None else url
+
+async def start() -> aiohttp.ClientSession:
+    global _session
+    # без await усередині: дві корутини не створять дві сесії
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=LIMIT_TOTAL,
+            limit_per_host=LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_TTL_SEC,
+            keepalive_timeout=KEEPALIVE_SEC,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=TOTAL_TIMEOUT_SEC,
+            sock_connect=CONNECT_TIMEOUT_SEC,
+            sock_read=READ_TIMEOUT_SEC,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+        )
+        log.info("HTTP-клієнт запущено (limit_per_host=%s)", LIMIT_PER_HOST)
+    return _session
+
+async def close():
+    global _session
+    s, _session = _session, None
+    if s is not None and not s.closed:
+        await s.close()
+
+async def session() -> aiohttp.ClientSession:
+    # ліниво стартуємо, якщо модуль використовується поза bot.build_app (CLI)
+    if _session is None or _session.closed:
+        return await start()
+    return _session
+
+async def fetch_bytes(url: str, headers: dict | None = None) -> bytes:
+    s = await session()
+    async with s.get(_url(url), headers=headers) as resp:
+        resp.raise_for_status()
+        return await resp.read()
+
+async def get(url: str, headers: dict | None = None) -> Response:
+    # як fetch_bytes, але 304 Not Modified не вважається помилкою
+    s = await session()
+    async with s.get(_url(url), headers=headers) as resp:
+        if resp.status == 304:
+            return Response(304, resp.headers.copy(), b"")
+        resp.raise_for_status()
+        return Response(resp.status, resp.headers.copy(), await resp.read())
+
+@asynccontextmanager
+async def stream(url: str, headers: dict | None = None) -> AsyncIterator[aiohttp.ClientResponse]:
+    # тіло читається частинами (resp.content.iter_chunked); 304 не вважається помилкою
+    s = await session()
+    async with s.get(_url(url), headers=headers) as resp:
+        if resp.status != 304:
+            resp.raise_for_status()
+        yield resp
@@ -0,0 +1,106 @@
+# core/items.py
+import sys
+import struct
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+def _restore(title: str, url: str, day: int, source: str, section: str | None) -> "NewsItem":
+    return NewsItem(title, url, day, sys.intern(source), section and sys.intern(section))
+
+@dataclass(frozen=True, slots=True)
+class NewsItem:
+    title: str
+    url: str
+    day: int                    # date.toordinal()
+    # URL стрічки і розділ однакові для сотень новин — інтерновані, один об'єкт на всіх
+    source: str
+    section: str | None = None
+
+    @classmethod
+    def new(cls, title: str, url: str, day: date, source: str, section: str | None = None) -> "NewsItem":
+        return cls(title, url, day.toordinal(), sys.intern(source), section and sys.intern(section))
+
+    @property
+    def date(self) -> str:
+        # YYYY-MM-DD, як у повідомленнях і в архіві
+        return date.fromordinal(self.day).isoformat()
+
+    def __reduce__(self):
+        # з ProcessPool приходять копії рядків — інтернуємо їх знову
+        return _restore, (self.title, self.url, self.day, self.source, self.section)
+
+# Бінарний формат списку новин:
+#   заголовок  MAGIC, к-сть рядків у таблиці, к-сть новин, довжина тексту
+#   таблиця    source/section без повторів: u16 довжина + utf-8
+#   записи     u32 день, u16 source, u16 section (NO_SECTION — немає)
+#   текст      "title\0url\0title\0url..." одним utf-8 блоком
+MAGIC = b"NWS1"
+_HEADER = struct.Struct("<4sIII")
+_LEN = struct.Struct("<H")
+_RECORD = struct.Struct("<IHH")
+NO_SECTION = 0xFFFF
+
+def dumps(items: Iterable[NewsItem]) -> bytes:
+    table: dict[str, int] = {}
+    records = bytearray()
+    texts = []
+    n = 0
+    for it in items:
+        src = table.setdefault(it.source, len(table))
+        sec = NO_SECTION if it.section is None else table.setdefault(it.section, len(table))
+        records += _RECORD.pack(it.day, src, sec)
+        # \0 у заголовку чи URL трапитись не може, але роздільник має бути однозначним
+        texts.append(it.title.replace("\0", " "))
+        texts.append(it.url.replace("\0", ""))
+        n += 1
+    if len(table) >= NO_SECTION:
+        raise ValueError("забагато різних source/section для одного блоку")
+    text = "\0".join(texts).encode("utf-8")
+    out = bytearray(_HEADER.pack(MAGIC, len(table), n, len(text)))
+    for s in table:
+        raw = s.encode("utf-8")
+        out += _LEN.pack(len(raw)) + raw
+    out += records
+    out += text
+    return bytes(out)
+
+def loads(data: bytes | memoryview) -> list[NewsItem]:
+    magic, n_strings, n, text_len = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("не блок новин")
+    pos = _HEADER.size
+    strings = []
+    for _ in range(n_strings):
+        (size,) = _LEN.unpack_from(data, pos)
+        pos += _LEN.size
+        strings.append(sys.intern(bytes(data[pos:pos + size]).decode("utf-8")))
+        pos += size
+    end = pos + n * _RECORD.size
+    records = _RECORD.iter_unpack(data[pos:end])
+    texts = bytes(data[end:end + text_len]).decode("utf-8").split("\0") if n else []
+    # останній елемент — для NO_SECTION: min(sec, n_strings) вказує саме сюди
+    strings.append(None)
+    # минаємо __init__ замороженого класу: дескриптори слотів пишуть напряму, утричі швидше
+    new = object.__new__
+    set_title, set_url, set_day = NewsItem.title.__set__, NewsItem.url.__set__, NewsItem.day.__set__
+    set_source, set_section = NewsItem.source.__set__, NewsItem.section.__set__
+    items = []
+    for (day, src, sec), title, url in zip(records, texts[0::2], texts[1::2]):
+        it = new(NewsItem)
+        set_title(it, title)
+        set_url(it, url)
+        set_day(it, day)
+        set_source(it, strings[src])
+        set_section(it, strings[min(sec, n_strings)])
+        items.append(it)
+    return items
+
+def size_of(data: bytes | memoryview) -> int:
+    # довжина блоку, що починається з data[0] — щоб читати кілька блоків поспіль
+    _, n_strings, n, text_len = _HEADER.unpack_from(data)
+    pos = _HEADER.size
+    for _ in range(n_strings):
+        (size,) = _LEN.unpack_from(data, pos)
+        pos += _LEN.size + size
+    return pos + n * _RECORD.size + text_len
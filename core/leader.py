@@ -0,0 +1,76 @@
+# core/leader.py
+import os
+import fcntl
+import asyncio
+import logging
+import inspect
+from typing import Any, Callable
+
+from core.store import NEWS_DB_PATH
+
+log = logging.getLogger("news-bot.leader")
+
+LEADER_LOCK_PATH = os.environ.get("LEADER_LOCK_PATH", f"{NEWS_DB_PATH}.leader")
+# як часто не-лідер перевіряє, чи не звільнився замок (напр. лідер упав)
+LEADER_RETRY_SEC = float(os.environ.get("LEADER_RETRY_SEC", "5"))
+
+class LeaderElection:
+    """Один лідер на розгортання: той, хто тримає flock на спільному файлі.
+
+    Замок знімає ядро, щойно процес-власник завершується, тож після падіння
+    лідера наступний воркер перехоплює роль за LEADER_RETRY_SEC.
+    """
+
+    def __init__(self, on_elected: Callable[[], Any], path: str = LEADER_LOCK_PATH,
+                 retry_sec: float = LEADER_RETRY_SEC):
+        self.on_elected = on_elected
+        self.path = path
+        self.retry_sec = retry_sec
+        self._fd: int | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    async def _loop(self):
+        while not self.try_acquire():
+            await asyncio.sleep(self.retry_sec)
+        log.info("Процес %s став лідером (%s)", os.getpid(), self.path)
+        result = self.on_elected()
+        if inspect.isawaitable(result):
+            await result
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="leader-election")
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.release()
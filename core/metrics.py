@@ -0,0 +1,166 @@
+# core/metrics.py
+import time
+import asyncio
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+log = logging.getLogger("news-bot.metrics")
+
+# запис — це пошук у dict і додавання; рендер тексту лише під час /metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_registry: list = []
+
+def _fmt_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+def _values(metric) -> dict[tuple, float]:
+    values = dict(metric._values)
+    if metric.fn is not None:
+        try:
+            values.update(metric.fn())
+        except Exception:
+            log.exception("%s: помилка збору", metric.name)
+    return values
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 fn: Callable[[], dict[tuple, float]] | None = None):
+        # fn — для лічильників, які вже ведуться деінде (напр. page_cache.stats())
+        self.name, self.help, self.labels = name, help, labels
+        self.fn = fn
+        self._values: dict[tuple, float] = {}
+        _registry.append(self)
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, v in _values(self).items():
+            yield f"{self.name}{_fmt_labels(self.labels, labels)} {_fmt_value(v)}"
+
+class Gauge:
+    """Значення знімається під час scrape: fn() -> {мітки: значення}."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 fn: Callable[[], dict[tuple, float]] | None = None):
+        self.name, self.help, self.labels = name, help, labels
+        self.fn = fn
+        self._values: dict[tuple, float] = {}
+        _registry.append(self)
+
+    def set(self, value: float, *labels):
+        self._values[labels] = value
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, v in _values(self).items():
+            yield f"{self.name}{_fmt_labels(self.labels, labels)} {_fmt_value(v)}"
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(sorted(buckets))
+        # мітки -> [лічильники кошиків (+Inf останній), сума]
+        self._series: dict[tuple, list] = {}
+        _registry.append(self)
+
+    def observe(self, value: float, *labels):
+        s = self._series.get(labels)
+        if s is None:
+            s = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        s[0][bisect_left(self.buckets, value)] += 1
+        s[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *labels)
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in self._series.items():
+            acc = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                acc += c
+                le = 'le="' + _fmt_value(bound) + '"'
+                yield f"{self.name}_bucket{_fmt_labels(self.labels, labels, le)} {acc}"
+            yield f"{self.name}_sum{_fmt_labels(self.labels, labels)} {_fmt_value(total)}"
+            yield f"{self.name}_count{_fmt_labels(self.labels, labels)} {acc}"
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+class LoopLagMonitor:
+    """Наскільки пізніше за план прокидається цикл подій: прямий показник блокувань."""
+
+    def __init__(self, interval_sec: float = 0.5):
+        self.interval = interval_sec
+        self.last = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, time.perf_counter() - t0 - self.interval)
+            loop_lag.observe(self.last)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="loop-lag")
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+# --- джерела
+fetch_seconds = Histogram("news_fetch_seconds", "Latency of page/feed fetches", ("source",))
+http_responses = Counter("news_http_responses_total", "HTTP responses by status", ("source", "status"))
+bytes_downloaded = Counter("news_bytes_downloaded_total", "Response body bytes downloaded", ("source",))
+parse_seconds = Histogram("news_parse_seconds", "Time spent in extractors", ("source",))
+items_extracted = Counter("news_items_extracted_total", "Items produced by extractors", ("source",))
+items_dropped = Counter("news_items_dropped_total", "Items dropped before rendering", ("source", "reason"))
+source_errors = Counter("news_source_errors_total", "Sources that failed in a run", ("source",))
+source_skipped = Counter("news_source_skipped_total", "Runs skipped by an open circuit breaker", ("source",))
+retries = Counter("news_retries_total", "Retried fetches", ("source",))
+hedged_requests = Counter("news_hedged_requests_total", "Hedged second requests sent", ("source",))
+hedge_wins = Counter("news_hedge_wins_total", "Hedged requests that answered first", ("source",))
+
+# --- бот
+command_seconds = Histogram("news_command_seconds", "Handler latency until the last reply is sent", ("command",))
+telegram_send_seconds = Histogram("news_telegram_send_seconds", "sendMessage round-trip latency")
+telegram_retry_after = Counter("news_telegram_retry_after_total", "429 Too Many Requests responses")
+telegram_send_errors = Counter("news_telegram_send_errors_total", "sendMessage calls that failed")
+loop_lag = Histogram("news_event_loop_lag_seconds", "Event loop scheduling delay", buckets=LAG_BUCKETS)
@@ -0,0 +1,136 @@
+# core/neardup.py
+import os
+import re
+import random
+import hashlib
+from functools import lru_cache
+
+NEARDUP_ENABLED = os.environ.get("NEARDUP_ENABLED", "1") == "1"
+# частка спільних (нормалізованих) слів, з якої два заголовки — одна історія
+NEARDUP_MIN_JACCARD = float(os.environ.get("NEARDUP_MIN_JACCARD", "0.6"))
+# і не менше стількох спільних слів (без чисел): у коротких заголовках 0.6 —
+# це два-три слова, а «НБУ підвищив/знизив ставку» — різні історії
+NEARDUP_MIN_SHARED = int(os.environ.get("NEARDUP_MIN_SHARED", "4"))
+# MinHash-підпис: BANDS смуг по ROWS значень; кандидати — ті, що збіглися хоч в одній смузі
+NEARDUP_BANDS = int(os.environ.get("NEARDUP_BANDS", "12"))
+NEARDUP_ROWS = int(os.environ.get("NEARDUP_ROWS", "3"))
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# «- Reuters», «| Мінфін» тощо наприкінці заголовка
+_SUFFIX_RE = re.compile(r"\s+[-–—|]\s+[^-–—|]{2,30}$")
+_STOP = frozenset("""
+в у на з із зі до від про по за для що як та і й а але чи не це його її їх
+the a an of to in on for and or at by with from is are as its after over
+""".split())
+_MASK32 = (1 << 32) - 1
+# фіксоване зерно: підписи однакові в усіх процесах і між перезапусками
+_rng = random.Random(0x5EED)
+_HASHES = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NEARDUP_BANDS * NEARDUP_ROWS)]
+# короткий «стемінг»: українські закінчення відмінків зливаються до спільної основи
+_STEM = 6
+
+def tokens(title: str) -> frozenset[str]:
+    words = _WORD_RE.findall(_SUFFIX_RE.sub("", title).lower())
+    # числа — цілком: «17» і «170» чи 1000000 і 1000001 не мають злитися
+    return frozenset(
+        w if w.isdigit() else w[:_STEM]
+        for w in words if w not in _STOP and (len(w) > 1 or w.isdigit())
+    )
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _numbers(words: frozenset[str]) -> frozenset[str]:
+    return frozenset(w for w in words if w.isdigit())
+
+def same_story(a: frozenset[str], b: frozenset[str], min_jaccard: float = NEARDUP_MIN_JACCARD) -> bool:
+    # курс на 17 і на 18 жовтня, $60 000 і $70 000 — різні новини, хоч би як схожі слова
+    if _numbers(a) != _numbers(b):
+        return False
+    shared = a & b
+    if len(shared) - len(_numbers(shared)) < NEARDUP_MIN_SHARED:
+        return False
+    return jaccard(a, b) >= min_jaccard
+
+@lru_cache(maxsize=int(os.environ.get("NEARDUP_CACHE_SIZE", "50000")))
+def signature(title: str) -> tuple[frozenset[str], tuple[int, ...]]:
+    """Токени заголовка і їхній MinHash: мінімум кожної з BANDS*ROWS хеш-функцій."""
+    words = tokens(title)
+    if not words:
+        return words, ()
+    return words, tuple(map(min, zip(*map(_word_hashes, words))))
+
+@lru_cache(maxsize=int(os.environ.get("NEARDUP_CACHE_SIZE", "50000")))
+def _word_hashes(word: str) -> tuple[int, ...]:
+    # слова повторюються між заголовками частіше, ніж самі заголовки
+    x = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+    return tuple(((a * x + b) >> 32) & _MASK32 for a, b in _HASHES)
+
+class StoryIndex:
+    """LSH-індекс заголовків: порівнюємо лише з тими, хто має спільну смугу підпису.
+
+    Ймовірність стати кандидатом — 1-(1-J^ROWS)^BANDS: для J=0.6 це ~0.95, для
+    J=0.2 — ~0.09, тож повний перебір не потрібен; кандидатів перевіряємо same_story.
+    """
+
+    def __init__(self, min_jaccard: float = NEARDUP_MIN_JACCARD):
+        self.min_jaccard = min_jaccard
+        self._buckets: dict[tuple, list[int]] = {}
+        self._tokens: list[frozenset[str]] = []
+        self.compared = 0
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @staticmethod
+    def _keys(sig: tuple[int, ...]):
+        r = NEARDUP_ROWS
+        return [(band, sig[band * r:(band + 1) * r]) for band in range(len(sig) // r)]
+
+    def query(self, title: str) -> list[int]:
+        words, sig = signature(title)
+        found, seen = [], set()
+        for key in self._keys(sig):
+            for i in self._buckets.get(key, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                self.compared += 1
+                if same_story(words, self._tokens[i], self.min_jaccard):
+                    found.append(i)
+        return sorted(found)
+
+    def add(self, title: str) -> int:
+        words, sig = signature(title)
+        i = len(self._tokens)
+        self._tokens.append(words)
+        for key in self._keys(sig):
+            self._buckets.setdefault(key, []).append(i)
+        return i
+
+def clusters(titles: list[str], min_jaccard: float = NEARDUP_MIN_JACCARD) -> list[list[int]]:
+    """Індекси схожих заголовків групами; групи і їхні члени — у порядку появи."""
+    index = StoryIndex(min_jaccard)
+    parent: list[int] = []
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for title in titles:
+        matches = index.query(title)
+        i = index.add(title)
+        parent.append(i)
+        for j in matches:
+            a, b = root(i), root(j)
+            if a != b:
+                # корінь — найраніший: перша поява історії лишається основною
+                parent[max(a, b)] = min(a, b)
+    groups: dict[int, list[int]] = {}
+    for i in range(len(titles)):
+        groups.setdefault(root(i), []).append(i)
+    return list(groups.values())
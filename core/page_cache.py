@@ -0,0 +1,141 @@
+# core/page_cache.py
+import time
+import hashlib
+import logging
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, asdict
+from typing import Callable, Hashable
+
+import aiohttp
+
+from core import executor, http_client, metrics, resilience, tracing
+
+log = logging.getLogger("news-bot.page_cache")
+
+MAX_PAGES = 64
+MAX_ENTRIES = 256
+
+@dataclass
+class Page:
+    url: str
+    source: str
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    body: bytes
+
+@dataclass
+class _Entry:
+    digest: bytes
+    items: list
+
+@dataclass
+class CacheStats:
+    misses: int = 0          # сторінку розібрано заново
+    hits: int = 0            # тіло не змінилось (304 або збіг хешу) — без повторного розбору
+    not_modified: int = 0    # сервер відповів 304
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0     # розмір тіл, які не довелося качати (304)
+    unexpected_304: int = 0  # 304, хоча збереженої копії немає — запит повторено безумовно
+
+# останнє тіло кожної сторінки (для валідаторів і розбору після 304)
+_pages: OrderedDict[str, Page] = OrderedDict()
+# розібрані новини: (url, екстрактор, варіант) -> хеш тіла + результат
+_entries: OrderedDict[tuple, _Entry] = OrderedDict()
+_stats: defaultdict[str, CacheStats] = defaultdict(CacheStats)
+
+def _lru_put(cache: OrderedDict, key, value, limit: int):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+async def fetch(url: str, *, source: str, headers: dict | None = None) -> Page:
+    # умовний GET; на 304 повертається збережене тіло
+    prev = _pages.get(url)
+    stats = _stats[source]
+
+    req_headers = dict(headers or {})
+    if prev is not None:
+        if prev.etag:
+            req_headers["If-None-Match"] = prev.etag
+        if prev.last_modified:
+            req_headers["If-Modified-Since"] = prev.last_modified
+
+    async def get(h: dict):
+        return await resilience.call(source, lambda: http_client.get(url, headers=h))
+
+    t0 = time.perf_counter()
+    try:
+        with tracing.span("fetch", source=source, url=url):
+            resp = await get(req_headers)
+            if resp.status == 304 and prev is None:
+                # тіла, з яким порівнювали, немає (напр. валідатор додав проміжний кеш):
+                # порожню сторінку з ETag ми б потім «підтверджували» вічно
+                stats.unexpected_304 += 1
+                metrics.http_responses.inc(source, resp.status)
+                resp = await get({**(headers or {}), "Cache-Control": "no-cache"})
+    except aiohttp.ClientResponseError as e:
+        metrics.http_responses.inc(source, e.status)
+        raise
+    except Exception:
+        metrics.http_responses.inc(source, "error")
+        raise
+    finally:
+        metrics.fetch_seconds.observe(time.perf_counter() - t0, source)
+    metrics.http_responses.inc(source, resp.status)
+    if resp.status == 304 and prev is not None:
+        stats.not_modified += 1
+        stats.bytes_saved += len(prev.body)
+        _pages.move_to_end(url)
+        return prev
+    if resp.status == 304:
+        log.warning("%s: 304 і на безумовний запит %s — сторінку пропущено", source, url)
+        return Page(url, source, None, None, b"", b"")
+
+    stats.bytes_downloaded += len(resp.body)
+    metrics.bytes_downloaded.inc(source, amount=len(resp.body))
+    page = Page(
+        url=url,
+        source=source,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        digest=hashlib.blake2b(resp.body, digest_size=16).digest(),
+        body=resp.body,
+    )
+    _lru_put(_pages, url, page, MAX_PAGES)
+    return page
+
+async def extract(page: Page, fn: Callable, *args, variant: Hashable = None) -> list:
+    """fn(body, *args) у пулі парсингу; для того ж тіла — збережений результат."""
+    # variant розрізняє виклики, чий результат залежить від args (напр. набір пропусків)
+    # повернений список спільний між викликами — змінювати його на місці не можна
+    key = (page.url, f"{fn.__module__}.{fn.__qualname__}", variant)
+    stats = _stats[page.source]
+    entry = _entries.get(key)
+    if entry is not None and entry.digest == page.digest:
+        stats.hits += 1
+        _entries.move_to_end(key)
+        metrics.items_extracted.inc(page.source, amount=len(entry.items))
+        return entry.items
+
+    stats.misses += 1
+    # розбір — у пулі процесів: туди йдуть сирі байти, назад лише список новин
+    with metrics.parse_seconds.time(page.source), tracing.span("parse", source=page.source, url=page.url):
+        items = await executor.run(fn, page.body, *args)
+    metrics.items_extracted.inc(page.source, amount=len(items))
+    _lru_put(_entries, key, _Entry(page.digest, items), MAX_ENTRIES)
+    return items
+
+async def fetch_items(url: str, fn: Callable, *args, source: str, headers: dict | None = None,
+                      variant: Hashable = None) -> list:
+    page = await fetch(url, source=source, headers=headers)
+    return await extract(page, fn, *args, variant=variant)
+
+def stats() -> dict[str, dict]:
+    return {source: asdict(s) for source, s in _stats.items()}
+
+def clear():
+    _pages.clear()
+    _entries.clear()
+    _stats.clear()
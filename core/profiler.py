@@ -0,0 +1,82 @@
+# core/profiler.py
+import sys
+import time
+import threading
+from collections import Counter
+
+# кадри, у яких цикл подій просто чекає на I/O
+_IDLE = {("selectors.py", "select"), ("selectors.py", "poll"), ("base_events.py", "_run_once")}
+
+def _key(code) -> tuple[str, int, str]:
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+class SamplingProfiler:
+    """Семплює стек одного потоку через sys._current_frames з фонового потоку.
+
+    Не перехоплює виклики (на відміну від cProfile), тож придатний для продакшену;
+    розбір у ProcessPool сюди не потрапляє — видно лише час циклу подій.
+    """
+
+    def __init__(self, interval_sec: float = 0.005, thread_id: int | None = None):
+        self.interval = interval_sec
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = 0
+        self.idle = 0
+        self.own: Counter = Counter()
+        self.total: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.started = self.stopped = 0.0
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        self.samples += 1
+        code = frame.f_code
+        if (code.co_filename.rsplit("/", 1)[-1], code.co_name) in _IDLE:
+            self.idle += 1
+            return
+        self.own[_key(code)] += 1
+        seen = set()
+        while frame is not None:
+            k = _key(frame.f_code)
+            if k not in seen:
+                seen.add(k)
+                self.total[k] += 1
+            frame = frame.f_back
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped = time.perf_counter()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def report(self, top: int = 25) -> str:
+        busy = self.samples - self.idle
+        lines = [
+            f"{self.samples} семплів по {self.interval * 1000:.0f} мс за {self.stopped - self.started:.2f} с; "
+            f"цикл подій зайнятий у {busy} ({busy / self.samples:.0%})" if self.samples else "семплів немає",
+        ]
+        for title, counter in (("власний час", self.own), ("разом із викликаними", self.total)):
+            lines += ["", f"Топ {top} — {title}:"]
+            for (filename, lineno, name), n in counter.most_common(top):
+                share = n / busy if busy else 0.0
+                lines.append(f"{share:6.1%} {n:6d}  {name}  {filename}:{lineno}")
+        return "\n".join(lines)
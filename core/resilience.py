@@ -0,0 +1,169 @@
+# core/resilience.py
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+
+from core import metrics
+
+log = logging.getLogger("news-bot.resilience")
+
+T = TypeVar("T")
+
+# загальний час на одне джерело (усі його сторінки, ретраї й пагінація)
+SOURCE_DEADLINE_SEC = float(os.environ.get("SOURCE_DEADLINE_SEC", "12"))
+
+RETRY_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_SEC = float(os.environ.get("RETRY_BASE_SEC", "0.3"))
+RETRY_CAP_SEC = float(os.environ.get("RETRY_CAP_SEC", "3"))
+
+# другий запит, якщо перший довший за p95 останніх відповідей цього джерела
+HEDGE_ENABLED = os.environ.get("HEDGE_ENABLED", "1") == "1"
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_SEC = float(os.environ.get("HEDGE_MIN_DELAY_SEC", "0.25"))
+
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN_SEC = float(os.environ.get("BREAKER_COOLDOWN_SEC", "120"))
+
+def deadline_for(source: str) -> float:
+    return float(os.environ.get(f"SOURCE_DEADLINE_{source.upper()}", SOURCE_DEADLINE_SEC))
+
+def retryable(e: BaseException) -> bool:
+    # 4xx (крім 429) повтор не виправить
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status >= 500 or e.status == 429
+    return isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError))
+
+def backoff(attempt: int, base: float = RETRY_BASE_SEC, cap: float = RETRY_CAP_SEC) -> float:
+    # експоненційна затримка з повним джитером: клієнти не б'ють у сайт синхронно
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class LatencyTracker:
+    def __init__(self, size: int = 200):
+        self.size = size
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, source: str, seconds: float):
+        samples = self._samples.get(source)
+        if samples is None:
+            samples = self._samples[source] = deque(maxlen=self.size)
+        samples.append(seconds)
+
+    def p95(self, source: str) -> float | None:
+        samples = self._samples.get(source)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+latency = LatencyTracker()
+
+async def hedged(source: str, factory: Callable[[], Awaitable[T]]) -> T:
+    p95 = latency.p95(source) if HEDGE_ENABLED else None
+    if p95 is None:
+        return await factory()
+
+    first = asyncio.ensure_future(factory())
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=max(p95, HEDGE_MIN_DELAY_SEC))
+        if done:
+            return first.result()
+        second = asyncio.ensure_future(factory())
+        tasks.add(second)
+        metrics.hedged_requests.inc(source)
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    if t is second:
+                        metrics.hedge_wins.inc(source)
+                    return t.result()
+                error = t.exception()
+        raise error
+    finally:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+
+async def call(source: str, factory: Callable[[], Awaitable[T]], *,
+               hedge: bool = True, attempts: int = RETRY_ATTEMPTS) -> T:
+    """factory() з ретраями (backoff + jitter) і, за потреби, хеджуванням."""
+    for attempt in range(attempts):
+        t0 = time.perf_counter()
+        try:
+            result = await (hedged(source, factory) if hedge else factory())
+        except Exception as e:
+            if attempt + 1 >= attempts or not retryable(e):
+                raise
+            delay = backoff(attempt)
+            metrics.retries.inc(source)
+            log.warning("%s: спроба %d не вдалась (%s) — повтор через %.2f с",
+                        source, attempt + 1, e or type(e).__name__, delay)
+            await asyncio.sleep(delay)
+            continue
+        latency.record(source, time.perf_counter() - t0)
+        return result
+    raise RuntimeError("unreachable")
+
+class CircuitBreaker:
+    """closed → (N збоїв поспіль) → open → (cooldown) → half-open: одна пробна спроба."""
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown_sec: float = BREAKER_COOLDOWN_SEC):
+        self.threshold = failures
+        self.cooldown = cooldown_sec
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def abandon(self):
+        # виклик скасовано ззовні — ні успіх, ні збій; пробну спробу звільняємо
+        self._trial = False
+
+    def failure(self):
+        self.failures += 1
+        was_trial, self._trial = self._trial, False
+        if was_trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+def breaker(source: str) -> CircuitBreaker:
+    b = _breakers.get(source)
+    if b is None:
+        b = _breakers[source] = CircuitBreaker()
+    return b
+
+def stats() -> dict[str, dict]:
+    return {
+        source: {"state": b.state, "failures": b.failures, "p95_sec": latency.p95(source)}
+        for source, b in _breakers.items()
+    }
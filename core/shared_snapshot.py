@@ -0,0 +1,95 @@
+# core/shared_snapshot.py
+import os
+import mmap
+import struct
+import logging
+
+from core.store import NEWS_DB_PATH
+
+log = logging.getLogger("news-bot.shared_snapshot")
+
+# спільний для всіх воркерів одного розгортання, поруч з архівом
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", f"{NEWS_DB_PATH}.snapshot")
+
+# MAGIC, версія, довжина даних; далі самі дані
+MAGIC = b"NSNP"
+_HEADER = struct.Struct("<4sQQ")
+
+class SharedSnapshot:
+    """Версіонований блоб у файлі, який читачі відображають у пам'ять (mmap).
+
+    Запис — у тимчасовий файл і os.replace: читач бачить або старий файл, або
+    новий цілком, ніколи не половину. Уже відкрите відображення старої версії
+    лишається дійсним і після заміни (і навіть видалення) файлу.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        self.path = path
+        self._key: tuple[int, int] | None = None   # (inode, mtime) відображеного файлу
+        self._map: mmap.mmap | None = None
+        self._version = 0
+        self._length = 0
+        self.published = 0
+        self.reloads = 0
+
+    def _current_version(self) -> int:
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, _ = _HEADER.unpack(f.read(_HEADER.size))
+        except (OSError, struct.error):
+            return 0
+        return version if magic == MAGIC else 0
+
+    def publish(self, data: bytes) -> int:
+        # версія зростає і після рестарту: продовжуємо від тієї, що у файлі
+        version = max(self._current_version(), self.published) + 1
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, version, len(data)))
+            f.write(data)
+        os.replace(tmp, self.path)
+        self.published = version
+        return version
+
+    def read(self) -> tuple[int, memoryview] | None:
+        """(версія, дані) без копіювання; None — знімка ще немає."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns)
+        if key != self._key:
+            if not self._remap(key):
+                return None
+        return self._version, memoryview(self._map)[_HEADER.size:_HEADER.size + self._length]
+
+    def _remap(self, key: tuple[int, int]) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # порожній файл або його саме замінили — спробуємо наступного разу
+            log.warning("Не вдалося відобразити %s: %s", self.path, e)
+            return False
+        magic, version, length = _HEADER.unpack_from(mm)
+        if magic != MAGIC or _HEADER.size + length > len(mm):
+            log.warning("Пошкоджений знімок %s — пропускаємо", self.path)
+            mm.close()
+            return False
+        # старе відображення не закриваємо: на нього можуть посилатися memoryview
+        self._map, self._key, self._version, self._length = mm, key, version, length
+        self.reloads += 1
+        return True
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "version": self._version,
+            "bytes": self._length,
+            "published": self.published,
+            "reloads": self.reloads,
+        }
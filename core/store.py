@@ -0,0 +1,114 @@
+# core/store.py
+import os
+import sqlite3
+import asyncio
+import logging
+import threading
+from datetime import date, datetime, timezone
+
+from core.items import NewsItem
+from core.urls import normalize_url
+
+log = logging.getLogger("news-bot.store")
+
+NEWS_DB_PATH = os.environ.get("NEWS_DB_PATH", "news.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id          INTEGER PRIMARY KEY,
+    url_norm    TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    date        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    feed        TEXT NOT NULL,
+    section     TEXT,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS articles_url_norm ON articles(url_norm);
+CREATE INDEX IF NOT EXISTS articles_date_source ON articles(date, source);
+"""
+
+UPSERT = """
+INSERT INTO articles (url_norm, url, title, date, source, feed, section, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url_norm) DO UPDATE SET
+    title = excluded.title,
+    last_seen = excluded.last_seen
+"""
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class ArticleStore:
+    def __init__(self, path: str = NEWS_DB_PATH):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        # одне з'єднання на процес; звертаємось до нього з потоків to_thread
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def upsert(self, rows: list[tuple[str, NewsItem]]) -> int:
+        # rows: (назва джерела, новина); один запис = одна транзакція на весь збір
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        params = [
+            (
+                normalize_url(n.url), n.url, n.title, n.date,
+                source, n.source, n.section, now, now,
+            )
+            for source, n in rows
+        ]
+        if not params:
+            return 0
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            try:
+                db.executemany(UPSERT, params)
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        return len(params)
+
+    def by_date(self, day: str) -> list[tuple[str, NewsItem]]:
+        with self._lock:
+            cur = self._db().execute(
+                "SELECT source, title, url, date, feed, section FROM articles "
+                "WHERE date = ? ORDER BY source, id",
+                (day,),
+            )
+            rows = cur.fetchall()
+        return [
+            (source, NewsItem.new(title, url, date.fromisoformat(d), feed, section))
+            for source, title, url, d, feed, section in rows
+        ]
+
+    async def save_results(self, results) -> int:
+        rows = [(r.source.name, n) for r in results for n in r.items]
+        try:
+            return await asyncio.to_thread(self.upsert, rows)
+        except Exception:
+            # архів — не критичний шлях: збій запису не має ламати видачу
+            log.exception("Не вдалося зберегти %d новин в архів", len(rows))
+            return 0
+
+    async def for_date(self, day: str) -> list[tuple[str, NewsItem]]:
+        return await asyncio.to_thread(self.by_date, day)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+articles = ArticleStore()
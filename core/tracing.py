@@ -0,0 +1,89 @@
+# core/tracing.py
+import time
+import uuid
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+log = logging.getLogger("news-bot.trace")
+
+@dataclass
+class Span:
+    name: str
+    start: float        # perf_counter відносно початку трасування
+    duration: float
+    attrs: dict
+
+@dataclass
+class Trace:
+    trace_id: str
+    name: str
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[Span] = field(default_factory=list)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def stages(self) -> dict[tuple[str, str], tuple[int, float]]:
+        # (етап, джерело) -> (кількість, сумарний час)
+        acc: dict[tuple[str, str], list] = defaultdict(lambda: [0, 0.0])
+        for s in self.spans:
+            a = acc[(s.name, s.attrs.get("source", "-"))]
+            a[0] += 1
+            a[1] += s.duration
+        return {k: (n, t) for k, (n, t) in acc.items()}
+
+    def timeline(self) -> str:
+        lines = [f"trace {self.trace_id} {self.name}: {self.elapsed * 1000:.1f} ms", ""]
+        for s in sorted(self.spans, key=lambda s: s.start):
+            attrs = " ".join(f"{k}={v}" for k, v in s.attrs.items())
+            lines.append(f"+{s.start * 1000:9.1f} ms {s.duration * 1000:9.1f} ms  {s.name:<8} {attrs}")
+        lines += ["", "за етапами:"]
+        for (name, source), (n, t) in sorted(self.stages().items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"{t * 1000:9.1f} ms  {name:<8} {source:<10} ×{n}")
+        return "\n".join(lines)
+
+# поточне трасування; задачі з gather/create_task успадковують його разом із контекстом
+_current: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+def current() -> Trace | None:
+    return _current.get()
+
+@contextmanager
+def trace(name: str):
+    t = Trace(uuid.uuid4().hex[:12], name)
+    token = _current.set(t)
+    try:
+        yield t
+    finally:
+        summary = ", ".join(
+            f"{stage}/{source}={total * 1000:.0f}ms"
+            for (stage, source), (_, total) in sorted(t.stages().items(), key=lambda kv: -kv[1][1])[:8]
+        )
+        log.info("%s: %.0f ms [%s]", name, t.elapsed * 1000, summary)
+        _current.reset(token)
+
+@contextmanager
+def span(name: str, **attrs):
+    # поза трасуванням — жодних витрат, крім одного ContextVar.get()
+    t = _current.get()
+    if t is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        t.spans.append(Span(name, t0 - t.started, end - t0, attrs))
+
+class TraceIdFilter(logging.Filter):
+    """Додає %(trace_id)s до кожного запису логу."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        t = _current.get()
+        record.trace_id = t.trace_id if t is not None else "-"
+        return True
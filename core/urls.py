@@ -0,0 +1,12 @@
+# core/urls.py
+from urllib.parse import urlsplit, urlunsplit
+
+def normalize_url(u: str, base: str = "") -> str:
+    # канонічний вигляд для унікалізації: без query/fragment і фінального слеша
+    u = u.strip()
+    if base and not u.startswith("http"):
+        u = base + u
+    s = urlsplit(u)
+    netloc = s.netloc.lower()
+    path = s.path.rstrip("/")
+    return urlunsplit((s.scheme, netloc, path, "", ""))
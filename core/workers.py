@@ -0,0 +1,64 @@
+# core/workers.py
+import os
+import time
+import signal
+import logging
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable
+
+log = logging.getLogger("news-bot.workers")
+
+# > 1 — кілька процесів aiohttp на одному порту (SO_REUSEPORT)
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", "1"))
+# воркер, що падає частіше, перезапускається із затримкою
+RESTART_BACKOFF_SEC = float(os.environ.get("WORKER_RESTART_BACKOFF_SEC", "1"))
+
+def _worker(target: Callable[[int], None], index: int):
+    # власна група процесів: Ctrl-C чи kill групи дістаються лише супервізора,
+    # і той передає воркерам рівно один SIGTERM
+    os.setpgrp()
+    target(index)
+
+def serve(target: Callable[[int], None], workers: int = WEB_WORKERS):
+    """Запускає target(index) у workers процесах і перезапускає тих, хто впав.
+
+    spawn, а не fork: кожен воркер імпортує застосунок начисто, без успадкованих
+    потоків, сесій і пулу парсингу батька.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    procs: dict[int, multiprocessing.Process] = {}
+    started_at: dict[int, float] = {}
+    stopping = False
+
+    def start(i: int):
+        p = ctx.Process(target=_worker, args=(target, i), name=f"web-{i}", daemon=False)
+        p.start()
+        procs[i], started_at[i] = p, time.monotonic()
+        log.info("Воркер %d запущено (pid %s)", i, p.pid)
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for p in procs.values():
+            if p.is_alive():
+                p.terminate()  # SIGTERM: aiohttp відпрацює on_cleanup
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for i in range(workers):
+        start(i)
+
+    while procs:
+        wait([p.sentinel for p in procs.values()], timeout=1.0)
+        for i, p in list(procs.items()):
+            if p.is_alive():
+                continue
+            p.join()
+            del procs[i]
+            if stopping:
+                continue
+            log.warning("Воркер %d (pid %s) завершився з кодом %s — перезапуск", i, p.pid, p.exitcode)
+            if time.monotonic() - started_at[i] < 10 * RESTART_BACKOFF_SEC:
+                time.sleep(RESTART_BACKOFF_SEC)
+            start(i)
@@ -0,0 +1,129 @@
+# delivery/jobs.py
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+log = logging.getLogger("news-bot.jobs")
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", "32"))
+# Telegram повторює апдейт, якщо вебхук не відповів вчасно; пам'ятаємо нещодавні update_id
+UPDATE_DEDUP_SIZE = int(os.environ.get("UPDATE_DEDUP_SIZE", "1024"))
+UPDATE_DEDUP_TTL_SEC = float(os.environ.get("UPDATE_DEDUP_TTL_SEC", "600"))
+
+QUEUED = "queued"
+DUPLICATE = "duplicate"   # такий самий запит цього чату ще в черзі або виконується
+BUSY = "busy"             # черга заповнена
+
+class JobQueue:
+    """Обмежена черга довгих команд і пул воркерів: вебхук лише ставить задачу."""
+
+    def __init__(self, workers: int = JOB_WORKERS, maxsize: int = JOB_QUEUE_SIZE):
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        # ключі (чат, команда, аргументи) від постановки до завершення
+        self._keys: set[Hashable] = set()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = {BUSY: 0, DUPLICATE: 0}
+        self._waits: list[float] = []
+
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._keys.clear()
+
+    def submit(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> str:
+        if key in self._keys:
+            self.rejected[DUPLICATE] += 1
+            return DUPLICATE
+        if self._queue is None:
+            raise RuntimeError("JobQueue не запущено")
+        try:
+            self._queue.put_nowait((key, factory, time.monotonic()))
+        except asyncio.QueueFull:
+            self.rejected[BUSY] += 1
+            return BUSY
+        self._keys.add(key)
+        return QUEUED
+
+    async def _worker(self):
+        while True:
+            key, factory, enqueued_at = await self._queue.get()
+            self._waits.append(time.monotonic() - enqueued_at)
+            del self._waits[:-1000]
+            self.running += 1
+            try:
+                await factory()
+            except Exception:
+                self.failed += 1
+                log.exception("Задача %s впала", key)
+            else:
+                self.completed += 1
+            finally:
+                self.running -= 1
+                self._keys.discard(key)
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected_busy": self.rejected[BUSY],
+            "rejected_duplicate": self.rejected[DUPLICATE],
+            "wait_p95_sec": round(waits[int(len(waits) * 0.95) - 1], 3) if waits else 0.0,
+        }
+
+class RecentUpdates(BaseMiddleware):
+    """Outer-middleware на dp.update: повторно доставлений апдейт не обробляється вдруге."""
+
+    def __init__(self, size: int = UPDATE_DEDUP_SIZE, ttl_sec: float = UPDATE_DEDUP_TTL_SEC):
+        self.size = size
+        self.ttl = ttl_sec
+        self._seen: OrderedDict[int, float] = OrderedDict()
+        self.dropped = 0
+
+    def seen(self, update_id: int) -> bool:
+        now = time.monotonic()
+        # найстаріші — на початку; прострочені й зайві викидаємо
+        while self._seen and (len(self._seen) >= self.size or now - next(iter(self._seen.values())) > self.ttl):
+            self._seen.popitem(last=False)
+        if update_id in self._seen:
+            return True
+        self._seen[update_id] = now
+        return False
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        if self.seen(event.update_id):
+            self.dropped += 1
+            log.info("Повторний update_id=%s — пропускаємо", event.update_id)
+            return None
+        return await handler(event, data)
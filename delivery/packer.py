@@ -0,0 +1,55 @@
+# delivery/packer.py
+from typing import Iterable
+
+# Telegram рахує довжину тексту в UTF-16 code units
+TELEGRAM_LIMIT = 4096
+
+def utf16_len(s: str) -> int:
+    return len(s.encode("utf-16-le")) // 2
+
+def _split_units(s: str, limit: int) -> list[str]:
+    # крайній випадок: один рядок довший за ліміт — ріжемо, не розриваючи сурогатні пари
+    parts, cur, cur_len = [], [], 0
+    for ch in s:
+        w = 2 if ord(ch) > 0xFFFF else 1
+        if cur_len + w > limit:
+            parts.append("".join(cur))
+            cur, cur_len = [], 0
+        cur.append(ch)
+        cur_len += w
+    if cur:
+        parts.append("".join(cur))
+    return parts
+
+def _fit(chunk: str, limit: int) -> list[str]:
+    # розбиваємо завеликий шматок по рядках, а рядок — по символах
+    if utf16_len(chunk) <= limit:
+        return [chunk]
+    out = []
+    for line in chunk.split("\n"):
+        out.extend(_split_units(line, limit) if utf16_len(line) > limit else [line])
+    return out
+
+def pack(chunks: Iterable[str], limit: int = TELEGRAM_LIMIT) -> list[str]:
+    """Жадібно складає цілі шматки (новини) у якомога менше повідомлень ≤ limit.
+
+    Шматки з'єднуються через "\\n"; провідні переводи рядка (роздільник
+    секцій) на початку нового повідомлення відкидаються.
+    """
+    messages: list[str] = []
+    cur = ""
+    cur_len = 0
+    for chunk in chunks:
+        for piece in _fit(chunk, limit):
+            if cur:
+                joined_len = cur_len + 1 + utf16_len(piece)
+                if joined_len <= limit:
+                    cur += "\n" + piece
+                    cur_len = joined_len
+                    continue
+                messages.append(cur)
+            cur = piece.lstrip("\n")
+            cur_len = utf16_len(cur)
+    if cur.strip():
+        messages.append(cur)
+    return messages
@@ -0,0 +1,241 @@
+# delivery/sender.py
+import os
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import LinkPreviewOptions
+
+from core import metrics
+
+log = logging.getLogger("news-bot.sender")
+
+# ліміти Telegram: ~30 повідомлень/с на бота і ~1/с на чат (з короткими сплесками)
+SEND_GLOBAL_RATE = float(os.environ.get("SEND_GLOBAL_RATE", "30"))
+SEND_GLOBAL_BURST = float(os.environ.get("SEND_GLOBAL_BURST", "30"))
+SEND_CHAT_RATE = float(os.environ.get("SEND_CHAT_RATE", "1"))
+SEND_CHAT_BURST = float(os.environ.get("SEND_CHAT_BURST", "5"))
+SEND_WORKERS = int(os.environ.get("SEND_WORKERS", "8"))
+SEND_MAX_RETRIES = int(os.environ.get("SEND_MAX_RETRIES", "5"))
+
+# менше число — вищий пріоритет
+PRIORITY_STATUS = 0
+PRIORITY_DIGEST = 10
+PRIORITY_BROADCAST = 20
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        # скільки чекати до появи одного токена
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    @property
+    def full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.burst
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    chat_id: int = field(compare=False)
+    text: str = field(compare=False)
+    kwargs: dict = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+    # "send" — нове повідомлення, "edit" — заміна тексту наявного (kwargs["message_id"])
+    method: str = field(default="send", compare=False)
+
+class SendScheduler:
+    """Черга вихідних повідомлень: token bucket на бота і на кожен чат, пріоритети, RetryAfter."""
+
+    def __init__(self, bot: Bot, workers: int = SEND_WORKERS,
+                 global_rate: float = SEND_GLOBAL_RATE, global_burst: float = SEND_GLOBAL_BURST,
+                 chat_rate: float = SEND_CHAT_RATE, chat_burst: float = SEND_CHAT_BURST):
+        self.bot = bot
+        self.workers = workers
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._global = TokenBucket(global_rate, global_burst)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        # у кожного чату своя купа (пріоритет, порядок); у _ready — чати, готові до відправки
+        self._chats: dict[int, list[_Job]] = {}
+        self._scheduled: set[int] = set()
+        self._ready: asyncio.PriorityQueue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._seq = itertools.count()
+        self._waits: deque[float] = deque(maxlen=1000)
+        self.sent = 0
+        self.failed = 0
+        self.retry_after = 0
+
+    def start(self):
+        if self._tasks:
+            return
+        self._ready = asyncio.PriorityQueue()
+        for chat_id in self._chats:
+            self._reschedule(chat_id)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"sender-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for heap in self._chats.values():
+            for job in heap:
+                if not job.future.done():
+                    job.future.cancel()
+        self._chats.clear()
+        self._scheduled.clear()
+
+    def send(self, chat_id: int, text: str, priority: int = PRIORITY_DIGEST, **kwargs) -> asyncio.Future:
+        return self._enqueue("send", chat_id, text, priority, kwargs)
+
+    def edit(self, chat_id: int, message_id: int, text: str,
+             priority: int = PRIORITY_STATUS, **kwargs) -> asyncio.Future:
+        # редагування теж рахується в ліміти Telegram, тож іде тією ж чергою
+        return self._enqueue("edit", chat_id, text, priority, {**kwargs, "message_id": message_id})
+
+    def _enqueue(self, method: str, chat_id: int, text: str, priority: int, kwargs: dict) -> asyncio.Future:
+        kwargs.setdefault("link_preview_options", LinkPreviewOptions(is_disabled=True))
+        job = _Job(
+            priority, next(self._seq), chat_id, text, kwargs,
+            asyncio.get_running_loop().create_future(), time.monotonic(), method=method,
+        )
+        heapq.heappush(self._chats.setdefault(chat_id, []), job)
+        if chat_id not in self._scheduled and self._ready is not None:
+            self._scheduled.add(chat_id)
+            self._ready.put_nowait((job.priority, job.seq, chat_id))
+        return job.future
+
+    async def send_many(self, chat_id: int, texts: list[str], priority: int = PRIORITY_DIGEST, **kwargs):
+        # порядок у межах чату зберігається (seq), тож ставимо все одразу
+        results = await asyncio.gather(
+            *(self.send(chat_id, t, priority, **kwargs) for t in texts),
+            return_exceptions=True,
+        )
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+        return results
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _reschedule(self, chat_id: int):
+        heap = self._chats.get(chat_id)
+        if not heap:
+            self._chats.pop(chat_id, None)
+            self._scheduled.discard(chat_id)
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is not None and bucket.full:
+                del self._chat_buckets[chat_id]
+            return
+        self._scheduled.add(chat_id)
+        if self._ready is not None:
+            self._ready.put_nowait((heap[0].priority, heap[0].seq, chat_id))
+
+    def _later(self, delay: float, chat_id: int):
+        asyncio.get_running_loop().call_later(delay, self._reschedule, chat_id)
+
+    async def _acquire_global(self):
+        while True:
+            wait = self._global.delay()
+            if wait <= 0:
+                self._global.take()
+                return
+            await asyncio.sleep(wait)
+
+    async def _worker(self):
+        while True:
+            _, _, chat_id = await self._ready.get()
+            heap = self._chats.get(chat_id)
+            while heap and heap[0].future.done():  # очікувача скасували
+                heapq.heappop(heap)
+            if not heap:
+                self._reschedule(chat_id)
+                continue
+
+            wait = self._chat_bucket(chat_id).delay()
+            if wait > 0:
+                # чат ще «остигає» — не тримаємо воркер, повернемось пізніше
+                self._later(wait, chat_id)
+                continue
+
+            job = heapq.heappop(heap)
+            self._chat_bucket(chat_id).take()
+            await self._acquire_global()
+            t0 = time.perf_counter()
+            try:
+                if job.method == "edit":
+                    msg = await self.bot.edit_message_text(text=job.text, chat_id=job.chat_id, **job.kwargs)
+                else:
+                    msg = await self.bot.send_message(job.chat_id, job.text, **job.kwargs)
+            except TelegramRetryAfter as e:
+                self.retry_after += 1
+                metrics.telegram_retry_after.inc()
+                job.attempts += 1
+                if job.attempts > SEND_MAX_RETRIES:
+                    self.failed += 1
+                    metrics.telegram_send_errors.inc()
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                    self._reschedule(chat_id)
+                    continue
+                log.warning("429 для чату %s — чекаємо %s с", chat_id, e.retry_after)
+                heapq.heappush(heap, job)
+                self._later(e.retry_after, chat_id)
+                continue
+            except Exception as e:
+                self.failed += 1
+                metrics.telegram_send_errors.inc()
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self.sent += 1
+                metrics.telegram_send_seconds.observe(time.perf_counter() - t0)
+                self._waits.append(time.monotonic() - job.enqueued_at)
+                if not job.future.done():
+                    job.future.set_result(msg)
+            self._reschedule(chat_id)
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "queue_depth": sum(len(h) for h in self._chats.values()),
+            "chats_pending": len(self._chats),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retry_after": self.retry_after,
+            "wait_avg_sec": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "wait_p95_sec": round(waits[int(len(waits) * 0.95) - 1], 3) if waits else 0.0,
+            "wait_max_sec": round(waits[-1], 3) if waits else 0.0,
+        }
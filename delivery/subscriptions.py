@@ -0,0 +1,270 @@
+# delivery/subscriptions.py
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta, timezone, time as dtime
+from typing import Awaitable, Callable
+from zoneinfo import ZoneInfo
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+from core.store import NEWS_DB_PATH, connect
+from delivery.sender import SendScheduler, PRIORITY_BROADCAST
+
+log = logging.getLogger("news-bot.subscriptions")
+
+# наприклад "09:00,18:00"; порожньо — розсилка вимкнена
+DIGEST_SLOTS = os.environ.get("DIGEST_SLOTS", "09:00,18:00")
+DIGEST_TZ = os.environ.get("DIGEST_TZ", "Europe/Kyiv")
+FANOUT_CONCURRENCY = int(os.environ.get("FANOUT_CONCURRENCY", "50"))
+# чати з тимчасовою помилкою (мережа, 5xx) — ще стільки проходів розсилки слоту
+FANOUT_RETRIES = int(os.environ.get("FANOUT_RETRIES", "3"))
+FANOUT_RETRY_SEC = float(os.environ.get("FANOUT_RETRY_SEC", "30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscribers (
+    chat_id        INTEGER PRIMARY KEY,
+    subscribed_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fanout_runs (
+    slot         TEXT PRIMARY KEY,
+    messages     TEXT NOT NULL,
+    created_at   TEXT NOT NULL,
+    finished_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS fanout_sent (
+    slot     TEXT NOT NULL,
+    chat_id  INTEGER NOT NULL,
+    sent     INTEGER,
+    PRIMARY KEY (slot, chat_id)
+);
+"""
+
+# помилки, після яких чат більше ніколи не прийме повідомлення
+_GONE_MARKERS = ("chat not found", "user is deactivated", "bot was kicked", "group chat was deactivated")
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+class SubscriptionStore:
+    def __init__(self, path: str = NEWS_DB_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.executescript(SCHEMA)
+            columns = {r[1] for r in self._conn.execute("PRAGMA table_info(fanout_sent)")}
+            if "sent" not in columns:
+                # у старих базах рядок означав «чат отримав увесь дайджест»: sent = NULL
+                self._conn.execute("ALTER TABLE fanout_sent ADD COLUMN sent INTEGER")
+        return self._conn
+
+    def _exec(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._db().execute(sql, params).rowcount
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._db().execute(sql, params).fetchall()
+
+    def add(self, chat_id: int) -> bool:
+        return self._exec(
+            "INSERT OR IGNORE INTO subscribers (chat_id, subscribed_at) VALUES (?, ?)",
+            (chat_id, _now_iso()),
+        ) > 0
+
+    def remove(self, chat_id: int) -> bool:
+        return self._exec("DELETE FROM subscribers WHERE chat_id = ?", (chat_id,)) > 0
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM subscribers")[0][0]
+
+    def open_run(self, slot: str, messages: list[str]) -> list[str]:
+        # якщо розсилка слоту вже почалась (рестарт), беремо збережений дайджест
+        self._exec(
+            "INSERT OR IGNORE INTO fanout_runs (slot, messages, created_at) VALUES (?, ?, ?)",
+            (slot, json.dumps(messages, ensure_ascii=False), _now_iso()),
+        )
+        rows = self._query("SELECT messages FROM fanout_runs WHERE slot = ?", (slot,))
+        return json.loads(rows[0][0])
+
+    def has_run(self, slot: str) -> bool:
+        return bool(self._query("SELECT 1 FROM fanout_runs WHERE slot = ?", (slot,)))
+
+    def unfinished_runs(self) -> list[str]:
+        rows = self._query("SELECT slot FROM fanout_runs WHERE finished_at IS NULL ORDER BY slot")
+        return [r[0] for r in rows]
+
+    def pending(self, slot: str, total: int) -> list[tuple[int, int]]:
+        # (чат, скільки з total повідомлень дайджесту він уже отримав)
+        rows = self._query(
+            "SELECT s.chat_id, COALESCE(f.sent, 0) FROM subscribers s "
+            "LEFT JOIN fanout_sent f ON f.slot = ? AND f.chat_id = s.chat_id "
+            "WHERE f.chat_id IS NULL OR f.sent < ? ORDER BY s.chat_id",
+            (slot, total),
+        )
+        return [(r[0], r[1]) for r in rows]
+
+    def mark_sent(self, slot: str, chat_id: int, sent: int):
+        self._exec(
+            "INSERT INTO fanout_sent (slot, chat_id, sent) VALUES (?, ?, ?) "
+            "ON CONFLICT (slot, chat_id) DO UPDATE SET sent = excluded.sent",
+            (slot, chat_id, sent),
+        )
+
+    def finish(self, slot: str):
+        self._exec("UPDATE fanout_runs SET finished_at = ? WHERE slot = ?", (_now_iso(), slot))
+        # журнал доставки потрібен лише для відновлення незавершеної розсилки
+        self._exec("DELETE FROM fanout_sent WHERE slot = ?", (slot,))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def parse_slots(spec: str) -> list[dtime]:
+    slots = []
+    for part in spec.split(","):
+        part = part.strip()
+        if part:
+            hh, mm = part.split(":")
+            slots.append(dtime(int(hh), int(mm)))
+    return sorted(slots)
+
+class DigestBroadcaster:
+    """Розсилка дайджесту підписникам у задані слоти; дайджест будується один раз на слот."""
+
+    def __init__(self, store: SubscriptionStore, sender: SendScheduler,
+                 build_digest: Callable[[], Awaitable[list[str]]],
+                 slots: str = DIGEST_SLOTS, tz: str = DIGEST_TZ,
+                 concurrency: int = FANOUT_CONCURRENCY):
+        self.store = store
+        self.sender = sender
+        self.build_digest = build_digest
+        self.slots = parse_slots(slots)
+        self.tz = ZoneInfo(tz)
+        self.concurrency = concurrency
+        self._task: asyncio.Task | None = None
+        self.delivered = 0
+        self.pruned = 0
+        self.failed = 0
+
+    def next_slot(self, now: datetime | None = None) -> datetime:
+        now = now or datetime.now(self.tz)
+        for day_offset in (0, 1):
+            day = (now + timedelta(days=day_offset)).date()
+            for t in self.slots:
+                at = datetime.combine(day, t, tzinfo=self.tz)
+                if at > now:
+                    return at
+        raise ValueError("no slots configured")
+
+    @staticmethod
+    def delay_until(at: datetime) -> float:
+        # не (at - now): для aware-дат з тією самою ZoneInfo Python віднімає
+        # настінний час і не бачить переходу на зимовий/літній час
+        return max(0.0, at.timestamp() - time.time())
+
+    async def run_slot(self, slot: str):
+        messages = None
+        if not await asyncio.to_thread(self.store.has_run, slot):
+            messages = await self.build_digest()
+            if not messages:
+                log.warning("Слот %s: порожній дайджест — розсилку пропущено", slot)
+                return
+        messages = await asyncio.to_thread(self.store.open_run, slot, messages or [])
+        failed = await self._fan_out(slot, messages)
+        for attempt in range(1, FANOUT_RETRIES + 1):
+            if not failed:
+                break
+            await asyncio.sleep(FANOUT_RETRY_SEC * attempt)
+            failed = await self._fan_out(slot, messages)
+        if failed:
+            log.warning("Слот %s: %d чатів так і не отримали дайджест повністю", slot, failed)
+        await asyncio.to_thread(self.store.finish, slot)
+
+    async def _send_from(self, slot: str, chat_id: int, messages: list[str], start: int):
+        # по одному: після збою жодне наступне повідомлення не піде раніше за нього;
+        # прогрес фіксуємо після кожного — рестарт чи повтор продовжать з першого ненадісланого.
+        # Пропускну здатність тримають інші чати (FANOUT_CONCURRENCY), а не черга одного
+        for i in range(start, len(messages)):
+            await self.sender.send(chat_id, messages[i], PRIORITY_BROADCAST)
+            await asyncio.to_thread(self.store.mark_sent, slot, chat_id, i + 1)
+
+    async def _fan_out(self, slot: str, messages: list[str]) -> int:
+        # повертає кількість чатів із тимчасовою помилкою: їхній прогрес не позначено
+        chats = await asyncio.to_thread(self.store.pending, slot, len(messages))
+        log.info("Слот %s: розсилка на %d чатів", slot, len(chats))
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(chat_id: int, start: int):
+            async with sem:
+                try:
+                    await self._send_from(slot, chat_id, messages, start)
+                except TelegramForbiddenError:
+                    await self._prune(chat_id)
+                except TelegramBadRequest as e:
+                    if any(m in str(e).lower() for m in _GONE_MARKERS):
+                        await self._prune(chat_id)
+                    else:
+                        self.failed += 1
+                        log.warning("Слот %s: не вдалося надіслати в %s: %s", slot, chat_id, e)
+                except Exception as e:
+                    # тайм-аут, 5xx тощо: прогрес лишається там, куди дійшов _send_from,
+                    # і наступний прохід продовжить з першого ненадісланого
+                    self.failed += 1
+                    log.warning("Слот %s: не вдалося надіслати в %s: %s", slot, chat_id, e)
+                    return True
+                else:
+                    self.delivered += 1
+                    return False
+                # постійна відмова: повтор дасть те саме — чат для цього слоту завершено
+                await asyncio.to_thread(self.store.mark_sent, slot, chat_id, len(messages))
+                return False
+
+        return sum(await asyncio.gather(*(deliver(c, start) for c, start in chats)))
+
+    async def _prune(self, chat_id: int):
+        self.pruned += 1
+        await asyncio.to_thread(self.store.remove, chat_id)
+        log.info("Чат %s заблокував бота або зник — відписано", chat_id)
+
+    async def _loop(self):
+        for slot in await asyncio.to_thread(self.store.unfinished_runs):
+            log.info("Відновлюємо незавершену розсилку %s", slot)
+            try:
+                await self.run_slot(slot)
+            except Exception:
+                log.exception("Помилка відновлення розсилки %s", slot)
+        while True:
+            at = self.next_slot()
+            await asyncio.sleep(self.delay_until(at))
+            try:
+                await self.run_slot(at.strftime("%Y-%m-%dT%H:%M"))
+            except Exception:
+                log.exception("Помилка розсилки слоту %s", at)
+
+    def start(self):
+        if not self.slots:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="digest-broadcast")
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict:
+        return {"delivered": self.delivered, "pruned": self.pruned, "failed": self.failed}
@@ -1,56 +1,83 @@
 # groups/easy_sources.py
 import os
-import io
-import runpy
-import contextlib
-
-def _run_and_capture(module_name: str) -> str:
-    buf = io.StringIO()
-    with contextlib.redirect_stdout(buf):
-        runpy.run_module(module_name, run_name="__main__")
-    text = buf.getvalue().strip()
-    if not text:
-        return ""
-    # додаємо 🟢 перед "Джерело:" у всіх виводах парсерів
-    text = text.replace("Джерело: ", "🟢Джерело: ")
-    return text
-
-@contextlib.contextmanager
-def _temp_env(key: str, value: str | None):
-    old = os.environ.get(key)
+import asyncio
+
+from core import executor, http_client
+from core.items import NewsItem
+from core.store import articles
+from groups.engine import Source, SourceResult, ResultStream, run_sources, render_blocks, render_messages
+from groups.prefetch import Prefetcher
+from groups.result_cache import ResultCache
+from parsers import epravda_parser, minfin_parser, coindesk_parser
+import reuters_parser
+
+SOURCES = (
+    Source("epravda", epravda_parser.parse_epravda, (epravda_parser.SOURCE_URL,)),
+    Source("minfin", minfin_parser.parse_minfin, minfin_parser.SOURCE_URLS),
+    Source("coindesk", coindesk_parser.parse_coindesk, (coindesk_parser.SOURCE_URL,)),
+    Source("reuters", reuters_parser.parse_reuters, (reuters_parser.SOURCE_URL,)),
+)
+
+async def collect(today_only: bool = False) -> list[SourceResult]:
+    results = await run_sources(SOURCES, today_only)
+    await articles.save_results(results)
+    return results
+
+async def results_for_date(day: str) -> list[SourceResult]:
+    # відповідь з архіву, без жодного мережевого запиту
+    by_source: dict[str, list[NewsItem]] = {s.name: [] for s in SOURCES}
+    for source, item in await articles.for_date(day):
+        if source in by_source:
+            by_source[source].append(item)
+    return [SourceResult(s, by_source[s.name]) for s in SOURCES]
+
+# фоновий «теплий» знімок; запускається з bot.build_app
+prefetcher = Prefetcher(collect)
+# спільний результат живого збору для одночасних команд із різних чатів
+result_cache = ResultCache()
+
+# поточні живі збори: одночасні команди читають один і той самий
+_live: dict[bool, ResultStream] = {}
+
+async def _store_stream(run: ResultStream):
+    results = run.ordered
+    await articles.save_results(results)
+    result_cache.put(("easy", run.today_only), render_messages(results))
+
+def live_results(today_only: bool = False) -> ResultStream:
+    run = _live.get(today_only)
+    if run is None or run.done:
+        run = _live[today_only] = ResultStream(SOURCES, today_only, on_done=_store_stream).start()
+    return run
+
+async def run_all(today_only: bool = False) -> list[str]:
+    return render_blocks(await collect(today_only))
+
+async def run_all_today() -> list[str]:
+    return await run_all(today_only=True)
+
+async def run_digest(today_only: bool = False) -> list[str]:
+    # те саме, що run_all, але упаковане в мінімум повідомлень Telegram
+    return render_messages(await collect(today_only))
+
+async def run_digest_cached(today_only: bool = False) -> list[str]:
+    return await result_cache.get(("easy", today_only), lambda: run_digest(today_only))
+
+async def _run_cli(sources, today_only: bool):
     try:
-        if value is None:
-            os.environ.pop(key, None)
-        else:
-            os.environ[key] = value
-        yield
+        return await run_sources(sources, today_only)
     finally:
-        if old is None:
-            os.environ.pop(key, None)
-        else:
-            os.environ[key] = old
-
-def run_all(today_only: bool = False) -> list[str]:
-    modules = (
-        "parsers.epravda_parser",
-        "parsers.minfin_parser",
-        "parsers.coindesk_parser",
-    )
-    blocks: list[str] = []
-    with _temp_env("ONLY_TODAY", "1" if today_only else None):
-        for mod in modules:
-            try:
-                out = _run_and_capture(mod)
-                if out:
-                    blocks.append(out)
-            except Exception as e:
-                blocks.append(f"❌ Помилка запуску {mod}: {e}")
-    return blocks
-
-def run_all_today() -> list[str]:
-    return run_all(today_only=True)
+        await http_client.close()
+        executor.shutdown()
 
-if __name__ == "__main__":
-    for block in run_all():
+def main(name: str | None = None):
+    # CLI: python -m groups.easy_sources або python -m parsers.<parser>
+    today_only = os.environ.get("ONLY_TODAY") == "1"
+    sources = [s for s in SOURCES if name is None or s.name == name]
+    results = asyncio.run(_run_cli(sources, today_only))
+    for block in render_blocks(results):
         print(block)
-        print()
\ No newline at end of file
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# groups/engine.py
+import struct
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+
+from core import items as news_items, metrics, resilience, tracing
+from core.dates import filter_by_date
+from core.items import NewsItem
+from core.neardup import NEARDUP_ENABLED, StoryIndex
+from delivery.packer import pack
+
+log = logging.getLogger("news-bot.engine")
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    parse: Callable[[bool], Awaitable[list[NewsItem]]]
+    # стрічки джерела у порядку друку (поле "source" у новинах)
+    feeds: tuple[str, ...]
+
+@dataclass
+class SourceResult:
+    source: Source
+    items: list[NewsItem] = field(default_factory=list)
+    error: str | None = None
+    # злиття схожих історій (Stories): URL основної новини -> ті самі історії з інших місць
+    alternates: dict[str, list[NewsItem]] = field(default_factory=dict)
+    # URL новин цього блоку, показаних як альтернативи в іншому місці
+    merged: set[str] = field(default_factory=set)
+
+    @property
+    def unique(self) -> list[NewsItem]:
+        # перше входження URL лишається за стрічкою, що йде раніше
+        seen = set()
+        unique = []
+        for n in self.items:
+            if n.url not in seen:
+                unique.append(n)
+                seen.add(n.url)
+        return unique
+
+async def run_source(source: Source, today_only: bool = False) -> SourceResult:
+    breaker = resilience.breaker(source.name)
+    if not breaker.allow():
+        # джерело недавно падало кілька разів поспіль — не чекаємо на нього
+        metrics.source_skipped.inc(source.name)
+        return SourceResult(source, error="circuit open")
+    deadline = resilience.deadline_for(source.name)
+    try:
+        with tracing.span("source", source=source.name):
+            items = await asyncio.wait_for(source.parse(today_only), deadline)
+    except asyncio.CancelledError:
+        breaker.abandon()
+        raise
+    except asyncio.TimeoutError:
+        breaker.failure()
+        log.warning("Джерело %s не вклалось у %g с", source.name, deadline)
+        metrics.source_errors.inc(source.name)
+        return SourceResult(source, error=f"timeout after {deadline:g}s")
+    except Exception as e:
+        breaker.failure()
+        log.exception("Помилка джерела %s", source.name)
+        metrics.source_errors.inc(source.name)
+        return SourceResult(source, error=str(e) or type(e).__name__)
+    breaker.success()
+    result = SourceResult(source, items)
+    dropped = len(items) - len(result.unique)
+    if dropped:
+        metrics.items_dropped.inc(source.name, "dedup", amount=dropped)
+    return result
+
+async def run_sources(sources, today_only: bool = False) -> list[SourceResult]:
+    return list(await asyncio.gather(*(run_source(s, today_only) for s in sources)))
+
+async def stream_sources(sources, today_only: bool = False) -> AsyncIterator[SourceResult]:
+    # у порядку готовності: перше джерело — через одне завантаження, а не через найповільніше
+    tasks = [asyncio.create_task(run_source(s, today_only)) for s in sources]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for t in tasks:
+            t.cancel()
+
+class ResultStream:
+    """Один живий збір на кількох читачів: кожен отримує всі результати в порядку готовності."""
+
+    def __init__(self, sources, today_only: bool = False,
+                 on_done: Callable[["ResultStream"], Awaitable[None]] | None = None):
+        self.sources = tuple(sources)
+        self.today_only = today_only
+        self.on_done = on_done
+        self.results: list[SourceResult] = []
+        self.done = False
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> "ResultStream":
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="result-stream")
+        return self
+
+    async def _run(self):
+        try:
+            async for r in stream_sources(self.sources, self.today_only):
+                async with self._changed:
+                    self.results.append(r)
+                    self._changed.notify_all()
+        finally:
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+        if self.on_done is not None:
+            await self.on_done(self)
+
+    async def subscribe(self) -> AsyncIterator[SourceResult]:
+        seen = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.results) > seen or self.done)
+                fresh = self.results[seen:]
+            for r in fresh:
+                yield r
+            seen += len(fresh)
+            if self.done and seen >= len(self.results):
+                return
+
+    @property
+    def ordered(self) -> list[SourceResult]:
+        # стабільний порядок джерел, незалежно від того, хто відповів першим
+        rank = {s.name: i for i, s in enumerate(self.sources)}
+        return sorted(self.results, key=lambda r: rank[r.source.name])
+
+    @property
+    def pending(self) -> list[str]:
+        finished = {r.source.name for r in self.results}
+        return [s.name for s in self.sources if s.name not in finished]
+
+class Stories:
+    """Злиття схожих заголовків між джерелами: історія показується раз, з усіма посиланнями.
+
+    Результати додаються в порядку показу; основна — перша поява історії. Якщо її блок
+    уже надіслано (прогресивна доставка), дубль просто не показується вдруге.
+    """
+
+    def __init__(self):
+        self.index = StoryIndex()
+        # для кожного запису індексу — (результат, основна новина) її історії
+        self._owners: list[tuple[SourceResult, NewsItem]] = []
+
+    def add(self, result: SourceResult) -> SourceResult:
+        if result.error is not None or not NEARDUP_ENABLED:
+            return result
+        out = SourceResult(
+            result.source, result.items, result.error,
+            {url: list(alts) for url, alts in result.alternates.items()}, set(result.merged),
+        )
+        for n in result.unique:
+            if n.url in out.merged:
+                continue
+            matches = self.index.query(n.title)
+            self.index.add(n.title)
+            if not matches:
+                self._owners.append((out, n))
+                continue
+            owner, primary = self._owners[matches[0]]
+            self._owners.append((owner, primary))
+            owner.alternates.setdefault(primary.url, []).append(n)
+            out.merged.add(n.url)
+        return out
+
+def collapse(results: list[SourceResult]) -> list[SourceResult]:
+    with tracing.span("neardup"):
+        stories = Stories()
+        return [stories.add(r) for r in results]
+
+def filter_results(results: list[SourceResult], today_only: bool) -> list[SourceResult]:
+    return [
+        SourceResult(r.source, filter_by_date(r.items, today_only), r.error)
+        for r in results
+    ]
+
+# результати в байтах: u16 к-сть; для кожного — назва, помилка (u32 довжина,
+# NO_ERROR — немає) і блок новин core.items
+_COUNT = struct.Struct("<H")
+_STR = struct.Struct("<I")
+NO_ERROR = 0xFFFFFFFF
+
+def dump_results(results: list[SourceResult]) -> bytes:
+    out = bytearray(_COUNT.pack(len(results)))
+    for r in results:
+        name = r.source.name.encode("utf-8")
+        out += _STR.pack(len(name)) + name
+        if r.error is None:
+            out += _STR.pack(NO_ERROR)
+        else:
+            error = r.error.encode("utf-8")
+            out += _STR.pack(len(error)) + error
+        out += news_items.dumps(r.items)
+    return bytes(out)
+
+def load_results(data: bytes | memoryview, sources) -> list[SourceResult]:
+    # джерела — за назвою з поточного коду: парсери не серіалізуються
+    by_name = {s.name: s for s in sources}
+    view = memoryview(data)
+    (count,), pos = _COUNT.unpack_from(view), _COUNT.size
+    results = []
+    for _ in range(count):
+        (size,) = _STR.unpack_from(view, pos)
+        name = bytes(view[pos + 4:pos + 4 + size]).decode("utf-8")
+        pos += 4 + size
+        (size,) = _STR.unpack_from(view, pos)
+        pos += 4
+        error = None
+        if size != NO_ERROR:
+            error = bytes(view[pos:pos + size]).decode("utf-8")
+            pos += size
+        block = news_items.size_of(view[pos:])
+        items = news_items.loads(view[pos:pos + block])
+        pos += block
+        if name in by_name:
+            results.append(SourceResult(by_name[name], items, error))
+    return results
+
+def render_chunks(result: SourceResult) -> list[str]:
+    # атомарні шматки блоку: шапка секції завжди разом із першою новиною
+    if result.error is not None:
+        # подробиці — у логах; читачеві достатньо знати, що джерела зараз немає
+        return [f"⚠️ {result.source.name}: джерело тимчасово недоступне"]
+
+    unique = [n for n in result.unique if n.url not in result.merged]
+    summary = (
+        f"✅ {result.source.name} - результат:\n"
+        f"   Усього знайдено {len(result.items)} (з урахуванням дублів)\n"
+        f"   Унікальних новин: {len(unique)}\n"
+    )
+    if result.merged:
+        summary += f"   Ще {len(result.merged)} — ті самі історії, що й вище\n"
+    by_feed: dict[str, list[NewsItem]] = {feed: [] for feed in result.source.feeds}
+    for n in unique:
+        by_feed.setdefault(n.source, []).append(n)
+
+    chunks = []
+    for feed, items in by_feed.items():
+        lines = [f"🟢Джерело: {feed} — {len(items)} новин:"]
+        lines += [
+            f"{i}. {n.title} ({n.date})\n   {n.url}"
+            + "".join(f"\n   ↳ {alt.url}" for alt in result.alternates.get(n.url, ()))
+            for i, n in enumerate(items, 1)
+        ]
+        head = "\n".join(lines[:2])
+        chunks.append((summary + "\n" + head) if not chunks else ("\n" + head))
+        chunks.extend(lines[2:])
+    return chunks or [summary.rstrip()]
+
+def render_block(result: SourceResult) -> str:
+    return "\n".join(render_chunks(result)).strip()
+
+def render_blocks(results: list[SourceResult]) -> list[str]:
+    return [b for b in map(render_block, collapse(results)) if b]
+
+def message_chunks(results: list[SourceResult]) -> list[str]:
+    chunks = []
+    for r in collapse(results):
+        rc = render_chunks(r)
+        if chunks and rc:
+            rc = ["\n" + rc[0]] + rc[1:]
+        chunks.extend(rc)
+    return chunks
+
+def render_messages(results: list[SourceResult]) -> list[str]:
+    # усі джерела разом, щільно упаковані в повідомлення Telegram
+    with tracing.span("render"):
+        return pack(message_chunks(results))
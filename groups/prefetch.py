@@ -0,0 +1,216 @@
+# groups/prefetch.py
+import os
+import time
+import struct
+import asyncio
+import logging
+import itertools
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from typing import Awaitable, Callable
+
+from core.shared_snapshot import SharedSnapshot
+from groups.engine import SourceResult, render_messages, filter_results, dump_results, load_results
+
+log = logging.getLogger("news-bot.prefetch")
+
+PREFETCH_INTERVAL_SEC = float(os.environ.get("PREFETCH_INTERVAL_SEC", "120"))
+SNAPSHOT_MAX_AGE_SEC = float(os.environ.get("SNAPSHOT_MAX_AGE_SEC", "600"))
+
+# знімок у байтах: час створення (unix), ординал дня, далі engine.dump_results
+_SNAPSHOT_HEADER = struct.Struct("<dI")
+# спільний знімок для воркерів — уже готові тексти, а не новини: час створення,
+# ординал дня, кількість повідомлень «усе» і «сьогодні»; далі всього+1 зсувів (u32)
+# у блоб UTF-8, де тексти лежать підряд
+_PACKED_HEADER = struct.Struct("<dIII")
+_OFFSET = struct.Struct("<I")
+
+class PackedMessages(Sequence):
+    """Повідомлення просто з відображеного знімка; текст декодується лише при зверненні."""
+
+    __slots__ = ("_data", "_first", "_count", "_blob")
+
+    def __init__(self, data: memoryview, first: int, count: int, blob: int):
+        self._data = data      # увесь знімок (пам'ять mmap)
+        self._first = first    # номер першого зсуву цього списку
+        self._count = count
+        self._blob = blob      # де в знімку починаються тексти
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        pos = _PACKED_HEADER.size + (self._first + i) * _OFFSET.size
+        start, = _OFFSET.unpack_from(self._data, pos)
+        end, = _OFFSET.unpack_from(self._data, pos + _OFFSET.size)
+        return str(self._data[self._blob + start:self._blob + end], "utf-8")
+
+@dataclass(frozen=True)
+class Snapshot:
+    created_at: float            # time.monotonic()
+    day: date                    # день, для якого рахувалось «сьогодні/вчора»
+    results: list[SourceResult]  # сьогодні+вчора
+    today_results: list[SourceResult]
+    # готові до відправки повідомлення (щільно упаковані)
+    messages: list[str]
+    today_messages: list[str]
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    @classmethod
+    def build(cls, day: date, results: list[SourceResult], created_at: float | None = None) -> "Snapshot":
+        # «тільки сьогодні» — фільтр того ж результату
+        today_results = filter_results(results, today_only=True)
+        return cls(
+            created_at=time.monotonic() if created_at is None else created_at,
+            day=day,
+            results=results,
+            today_results=today_results,
+            messages=render_messages(results),
+            today_messages=render_messages(today_results),
+        )
+
+    def dumps(self) -> bytes:
+        # повідомлення не зберігаємо: їх дешево перерендерити з новин
+        created = time.time() - self.age
+        return _SNAPSHOT_HEADER.pack(created, self.day.toordinal()) + dump_results(self.results)
+
+    def pack(self) -> bytes:
+        # для SharedView: воркерам не треба ні розбирати новини, ні рендерити
+        texts = [m.encode("utf-8") for m in itertools.chain(self.messages, self.today_messages)]
+        offsets = itertools.accumulate(map(len, texts), initial=0)
+        return b"".join([
+            _PACKED_HEADER.pack(time.time() - self.age, self.day.toordinal(),
+                                len(self.messages), len(self.today_messages)),
+            struct.pack(f"<{len(texts) + 1}I", *offsets),
+            *texts,
+        ])
+
+    @classmethod
+    def loads(cls, data: bytes | memoryview, sources) -> "Snapshot":
+        created, day = _SNAPSHOT_HEADER.unpack_from(data)
+        results = load_results(memoryview(data)[_SNAPSHOT_HEADER.size:], sources)
+        # monotonic не переноситься між процесами — відновлюємо вік через настінний час
+        created_at = time.monotonic() - max(0.0, time.time() - created)
+        return cls.build(date.fromordinal(day), results, created_at)
+
+@dataclass(frozen=True)
+class SharedView:
+    """Знімок лідера, як його бачить інший воркер: лише готові повідомлення з mmap."""
+    created_at: float            # time.monotonic() цього процесу
+    day: date
+    messages: PackedMessages
+    today_messages: PackedMessages
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    @classmethod
+    def unpack(cls, data: memoryview) -> "SharedView":
+        created, day, n_all, n_today = _PACKED_HEADER.unpack_from(data)
+        blob = _PACKED_HEADER.size + (n_all + n_today + 1) * _OFFSET.size
+        end, = _OFFSET.unpack_from(data, blob - _OFFSET.size)
+        if blob + end > len(data):
+            raise ValueError("обрізаний знімок")
+        return cls(
+            created_at=time.monotonic() - max(0.0, time.time() - created),
+            day=date.fromordinal(day),
+            messages=PackedMessages(data, 0, n_all, blob),
+            today_messages=PackedMessages(data, n_all, n_today, blob),
+        )
+
+class Prefetcher:
+    def __init__(self, collect: Callable[[bool], Awaitable[list[SourceResult]]],
+                 interval_sec: float = PREFETCH_INTERVAL_SEC,
+                 max_age_sec: float = SNAPSHOT_MAX_AGE_SEC):
+        # collect(today_only) — збір групи (напр. groups.easy_sources.collect)
+        self.collect = collect
+        self.interval_sec = interval_sec
+        self.max_age_sec = max_age_sec
+        # SharedView — у воркерах, що лише читають знімок лідера
+        self.snapshot: Snapshot | SharedView | None = None
+        self._task: asyncio.Task | None = None
+        # багатопроцесний режим: лідер публікує знімок, решта лише читає
+        self.shared: SharedSnapshot | None = None
+        self.version = 0
+
+    def share(self, shared: SharedSnapshot):
+        self.shared = shared
+
+    async def refresh(self) -> Snapshot:
+        day = date.today()
+        started = time.monotonic()
+        # одне вичитування за два дні
+        results = await self.collect(False)
+        self.snapshot = Snapshot.build(day, results)
+        if self.shared is not None:
+            try:
+                self.version = await asyncio.to_thread(self.shared.publish, self.snapshot.pack())
+            except OSError:
+                # інші воркери лишаться з попередньою версією, тут знімок свіжий
+                log.exception("Не вдалося опублікувати знімок у %s", self.shared.path)
+        log.info("Знімок новин оновлено за %.2f с", time.monotonic() - started)
+        return self.snapshot
+
+    def sync(self):
+        # читач: підхоплюємо новішу версію лідера — без копії, лише розмітка зсувів
+        if self.shared is None:
+            return
+        current = self.shared.read()
+        if current is None or current[0] <= self.version:
+            return
+        version, data = current
+        try:
+            self.snapshot = SharedView.unpack(data)
+        except Exception:
+            log.exception("Не вдалося прочитати знімок версії %d", version)
+        # і після збою не повторюємо розбір тієї самої версії на кожній команді
+        self.version = version
+
+    def fresh(self, max_age_sec: float | None = None) -> Snapshot | SharedView | None:
+        self.sync()
+        snap = self.snapshot
+        if snap is None or snap.day != date.today():
+            return None
+        if snap.age > (self.max_age_sec if max_age_sec is None else max_age_sec):
+            return None
+        return snap
+
+    def messages(self, today_only: bool = False, max_age_sec: float | None = None) -> list[str] | None:
+        snap = self.fresh(max_age_sec)
+        if snap is None:
+            return None
+        # str потрібні відправнику; у SharedView це єдине декодування
+        return list(snap.today_messages if today_only else snap.messages)
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                log.exception("Помилка фонового оновлення знімка")
+            await asyncio.sleep(self.interval_sec)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="news-prefetch")
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
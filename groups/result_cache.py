@@ -0,0 +1,90 @@
+# groups/result_cache.py
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Hashable
+
+log = logging.getLogger("news-bot.result_cache")
+
+RESULT_CACHE_TTL_SEC = float(os.environ.get("RESULT_CACHE_TTL_SEC", "60"))
+# довше за це застарілий результат не віддаємо навіть у stale-while-revalidate
+RESULT_CACHE_MAX_STALE_SEC = float(os.environ.get("RESULT_CACHE_MAX_STALE_SEC", "900"))
+
+@dataclass
+class CacheCounters:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0      # чекали на вже запущений збір замість власного
+    stale_served: int = 0   # віддали застарілий результат, оновлення йде у фоні
+    refreshes: int = 0
+    errors: int = 0
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+class ResultCache:
+    def __init__(self, ttl_sec: float = RESULT_CACHE_TTL_SEC,
+                 max_stale_sec: float = RESULT_CACHE_MAX_STALE_SEC):
+        self.ttl_sec = ttl_sec
+        self.max_stale_sec = max_stale_sec
+        self.counters = CacheCounters()
+        self._entries: dict[Hashable, _Entry] = {}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def put(self, key: Hashable, value: Any):
+        # результат, зібраний в обхід get (напр. потоковий збір)
+        self._entries[key] = _Entry(value, time.monotonic())
+
+    def cached(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() - entry.stored_at <= self.max_stale_sec
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age <= self.ttl_sec:
+                self.counters.hits += 1
+                return entry.value
+            if age <= self.max_stale_sec:
+                self.counters.stale_served += 1
+                self._start(key, loader)
+                return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters.coalesced += 1
+        else:
+            self.counters.misses += 1
+            task = self._start(key, loader)
+        # shield: скасування одного очікувача не зупиняє спільний збір
+        return await asyncio.shield(task)
+
+    def _start(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            # фонове оновлення може ніхто не чекати — помилку вже залоговано
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        except Exception:
+            self.counters.errors += 1
+            log.exception("Не вдалося оновити результат для %r", key)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self.counters.refreshes += 1
+        self._entries[key] = _Entry(value, time.monotonic())
+        return value
+
+    def stats(self) -> dict:
+        return {**asdict(self.counters), "inflight": len(self._inflight)}
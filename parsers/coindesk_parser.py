@@ -1,11 +1,11 @@
 # parsers/coindesk_parser.py
-import os
 import re
-from datetime import date, timedelta
+from datetime import date
 from urllib.parse import urljoin
 
-import requests
-from bs4 import BeautifulSoup
+from core import crawler, html_backends
+from core.dates import filter_by_date, oldest_date
+from core.items import NewsItem
 
 BASE = "https://www.coindesk.com"
 SOURCE_URL = "https://www.coindesk.com/uk/latest-crypto-news"
@@ -18,13 +18,6 @@ HEADERS = {
     )
 }
 
-ONLY_TODAY = os.environ.get("ONLY_TODAY") == "1"
-
-def _fetch(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=20)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
-
 def _abs(url: str) -> str:
     if url.startswith("http"):
         return url
@@ -40,30 +33,26 @@ def _extract_date_from_url(u: str) -> date | None:
     except Exception:
         return None
 
-def _best_title(a_tag) -> str:
-    t = (a_tag.get_text(strip=True) or "").strip()
+def _best_title(a_tag: html_backends.Node) -> str:
+    t = (a_tag.text() or "").strip()
     if t:
         return t
-    for parent in (a_tag, a_tag.parent, getattr(a_tag, "parent", None).parent if a_tag and a_tag.parent else None):
+    for parent in (a_tag, a_tag.parent, a_tag.parent.parent if a_tag and a_tag.parent else None):
         if not parent:
             continue
-        h = parent.find(["h2", "h3", "h4"])
+        h = parent.find_first(("h2", "h3", "h4"))
         if h:
-            tt = h.get_text(strip=True)
+            tt = h.text()
             if tt:
                 return tt
     return ""
 
-def parse_coindesk() -> list[dict]:
-    print("🔹 Парсимо CoinDesk...")
-
-    soup = _fetch(SOURCE_URL)
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    target = {today} if ONLY_TODAY else {today, yesterday}
-
+def _collect_latest(html: bytes, backend: str = html_backends.REFERENCE_BACKEND,
+                    subtree: html_backends.Subtree | None = None) -> list[NewsItem]:
+    # без subtree: _best_title дивиться на батьків посилання, тож потрібна вся сторінка
+    soup = html_backends.parse(html, backend, subtree)
     seen_urls = set()
-    items: list[dict] = []
+    items: list[NewsItem] = []
 
     for a in soup.select('a[href]'):
         href = a.get("href", "").strip()
@@ -77,7 +66,7 @@ def parse_coindesk() -> list[dict]:
             continue
 
         dt = _extract_date_from_url(url)
-        if not dt or dt not in target:
+        if not dt:
             continue
 
         title = _best_title(a)
@@ -88,29 +77,19 @@ def parse_coindesk() -> list[dict]:
             continue
         seen_urls.add(url)
 
-        items.append({
-            "title": title,
-            "url": url,
-            "date": dt.strftime("%Y-%m-%d"),
-            "source": SOURCE_URL,
-            "section": "coindesk-uk",
-        })
-
-    items.sort(key=lambda x: (x["date"], x["title"]), reverse=True)
+        items.append(NewsItem.new(title, url, dt, SOURCE_URL, "coindesk-uk"))
 
-    print("\n✅ coindesk - результат:")
-    print(f"   Усього знайдено {len(items)} (з урахуванням дублів)")
-    print(f"   Унікальних новин: {len(items)}\n")
-
-    print(f"🟢Джерело: {SOURCE_URL} — {len(items)} новин:")
-    for i, n in enumerate(items, 1):
-        print(f"{i}. {n['title']} ({n['date']})\n   {n['url']}")
-    print()
+    items.sort(key=lambda x: (x.day, x.title), reverse=True)
 
     return items
 
+async def parse_coindesk(today_only: bool = False) -> list[NewsItem]:
+    items = await crawler.crawl_items(
+        SOURCE_URL, _collect_latest, html_backends.backend_for("coindesk"),
+        source="coindesk", headers=HEADERS, oldest=oldest_date(today_only),
+    )
+    return filter_by_date(items, today_only, source="coindesk")
+
 if __name__ == "__main__":
-    try:
-        parse_coindesk()
-    except Exception as e:
-        print(f"❌ Помилка coindesk_parser: {e}")
\ No newline at end of file
+    from groups.easy_sources import main
+    main("coindesk")
@@ -1,12 +1,14 @@
 # parsers/epravda_parser.py
-import os
-import requests
-from bs4 import BeautifulSoup
-from datetime import date, timedelta
+from datetime import date
 from urllib.parse import urljoin
 
+from core import crawler, html_backends
+from core.dates import filter_by_date, oldest_date
+from core.items import NewsItem
+
 BASE = "https://www.epravda.com.ua"
 FINANCES_URL = "https://www.epravda.com.ua/finances/"
+SOURCE_URL = "https://epravda.com.ua/finances"
 
 UA_MONTHS = {
     "січня": 1, "лютого": 2, "березня": 3, "квітня": 4, "травня": 5, "червня": 6,
@@ -21,13 +23,6 @@ HEADERS = {
     )
 }
 
-ONLY_TODAY = os.environ.get("ONLY_TODAY") == "1"
-
-def _fetch(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=20)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
-
 def _parse_ua_date(text: str) -> date | None:
     if not text:
         return None
@@ -46,57 +41,35 @@ def _parse_ua_date(text: str) -> date | None:
     except Exception:
         return None
 
-def _collect_finances(soup: BeautifulSoup) -> list[dict]:
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    allowed = {today} if ONLY_TODAY else {today, yesterday}
+# матеріалізуємо лише картки новин, а не всю сторінку
+SUBTREE = (None, {"class": "article_news"})
+
+def _collect_finances(html: bytes, backend: str = html_backends.REFERENCE_BACKEND,
+                      subtree: html_backends.Subtree | None = SUBTREE) -> list[NewsItem]:
+    # усі датовані новини сторінки; фільтр за датою — у parse_epravda
+    soup = html_backends.parse(html, backend, subtree)
     items = []
     for news in soup.select(".article_news"):
         a = news.select_one(".article_title a")
         d = news.select_one(".article_date")
         if not a:
             continue
-        title = a.get_text(strip=True)
+        title = a.text()
         url = urljoin(BASE, a.get("href", "").strip())
-        date_str = d.get_text(strip=True) if d else ""
+        date_str = d.text() if d else ""
         dt = _parse_ua_date(date_str)
-        if dt in allowed:
-            items.append({
-                "title": title,
-                "url": url,
-                "date": dt.strftime("%Y-%m-%d"),
-                "source": "https://epravda.com.ua/finances",
-                "section": "finances",
-            })
+        if dt is not None:
+            items.append(NewsItem.new(title, url, dt, SOURCE_URL, "finances"))
     return items
 
-def parse_epravda() -> list[dict]:
-    print("🔹 Парсимо Epravda...")
-
-    soup_fin = _fetch(FINANCES_URL)
-    fin_items = _collect_finances(soup_fin)
-
-    all_found = fin_items
-    seen = set()
-    unique = []
-    for n in all_found:
-        if n["url"] not in seen:
-            unique.append(n)
-            seen.add(n["url"])
-
-    print("\n✅ epravda - результат:")
-    print(f"   Усього знайдено {len(all_found)} (з урахуванням дублів)")
-    print(f"   Унікальних новин: {len(unique)}\n")
-
-    print(f"🟢Джерело: https://epravda.com.ua/finances — {len(fin_items)} новин:")
-    for i, n in enumerate(fin_items, 1):
-        print(f"{i}. {n['title']} ({n['date']})\n   {n['url']}")
-    print()
-
-    return unique
+async def parse_epravda(today_only: bool = False) -> list[NewsItem]:
+    # йдемо сторінками стрічки, доки не дійдемо до новин, старших за вікно
+    fin_items = await crawler.crawl_items(
+        FINANCES_URL, _collect_finances, html_backends.backend_for("epravda"),
+        source="epravda", headers=HEADERS, oldest=oldest_date(today_only),
+    )
+    return filter_by_date(fin_items, today_only, source="epravda")
 
 if __name__ == "__main__":
-    try:
-        parse_epravda()
-    except Exception as e:
-        print(f"❌ Помилка epravda_parser: {e}")
\ No newline at end of file
+    from groups.easy_sources import main
+    main("epravda")
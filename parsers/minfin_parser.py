@@ -1,9 +1,13 @@
 # parsers/minfin_parser.py
 import os
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-from urllib.parse import urlsplit, urlunsplit
+import asyncio
+import logging
+from datetime import date, datetime
+
+from core import crawler, html_backends, page_cache
+from core.dates import filter_by_date, oldest_date
+from core.items import NewsItem
+from core.urls import normalize_url
 
 HEADERS = {
     "User-Agent": (
@@ -22,110 +26,129 @@ SECTIONS = [
     "ua/news/",
 ]
 
-ONLY_TODAY = os.environ.get("ONLY_TODAY") == "1"
+SOURCE_URLS = tuple(f"{BASE_URL}/{section.strip('/')}/" for section in SECTIONS)
 
-def _normalize_url(u: str) -> str:
-    u = u.strip()
-    if not u.startswith("http"):
-        u = BASE_URL + u
-    s = urlsplit(u)
-    netloc = s.netloc.lower()
-    path = s.path.rstrip("/")
-    return urlunsplit((s.scheme, netloc, path, "", ""))
+# загальна стрічка ua/news/ здебільшого повторює підрозділи: її рядки з уже
+# відомими URL можна не розбирати взагалі
+SKIP_KNOWN_IN_FEED = os.environ.get("MINFIN_SKIP_KNOWN", "1") == "1"
 
-def _fetch(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=20)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+log = logging.getLogger("news-bot.minfin")
 
-def parse_minfin():
-    all_news = []
-    per_source_raw = []
+def _normalize_url(u: str) -> str:
+    return normalize_url(u, BASE_URL)
 
-    today = datetime.now().date()
-    yesterday = today - timedelta(days=1)
-    target_dates = {today} if ONLY_TODAY else {today, yesterday}
+# матеріалізуємо лише рядки стрічки
+SUBTREE = ("li", {"class": "item"})
 
-    print("🔹 Парсимо Minfin...")
+def _row_date(date_tag) -> date | None:
+    raw_date = (date_tag.get("content") or date_tag.text() or "").strip()
+    parts0 = raw_date.split()
+    if not parts0:
+        return None
+    token = parts0[0]
+    try:
+        return datetime.strptime(token, "%Y-%m-%d").date()
+    except Exception:
+        try:
+            return datetime.strptime(token, "%d.%m.%Y").date()
+        except Exception:
+            return None
+
+def _collect_section(html: bytes, src_url: str, backend: str = html_backends.REFERENCE_BACKEND,
+                     skip: frozenset = frozenset(),
+                     subtree: html_backends.Subtree | None = SUBTREE) -> crawler.PageItems:
+    soup = html_backends.parse(html, backend, subtree)
+    items = crawler.PageItems()
+    for item in soup.select("li.item"):
+        date_tag = item.select_one("span.data")
+        title_tag = item.select_one("a")
+        if not date_tag or not title_tag:
+            continue
 
-    for section in SECTIONS:
-        src_url = f"{BASE_URL}/{section.strip('/')}/"
-        items_raw = []
+        news_date = _row_date(date_tag)
+        if news_date is None:
+            continue
 
-        try:
-            soup = _fetch(src_url)
-        except Exception as e:
-            print(f"⚠️ Не вдалося отримати {src_url}: {e}")
-            per_source_raw.append((src_url, items_raw))
+        href = title_tag.get("href", "").strip()
+        url = _normalize_url(href)
+        if url in skip:
+            # заголовок не розбираємо, але дату лишаємо: рядок усе одно є на сторінці
+            items.skipped.append((url, news_date.toordinal()))
             continue
 
-        for item in soup.select("li.item"):
-            date_tag = item.select_one("span.data")
-            title_tag = item.select_one("a")
-            if not date_tag or not title_tag:
-                continue
-
-            title = title_tag.get_text(strip=True)
-            href = title_tag.get("href", "").strip()
-            raw_date = (date_tag.get("content") or date_tag.get_text(strip=True) or "").strip()
-
-            news_date = None
-            parts0 = raw_date.split()
-            if parts0:
-                token = parts0[0]
-                try:
-                    news_date = datetime.strptime(token, "%Y-%m-%d").date()
-                except Exception:
-                    try:
-                        news_date = datetime.strptime(token, "%d.%m.%Y").date()
-                    except Exception:
-                        news_date = None
-            if news_date not in target_dates:
-                continue
-
-            url_norm = _normalize_url(href)
-            item_obj = {
-                "title": title,
-                "url": url_norm,
-                "date": str(news_date),
-                "source": src_url,
-            }
-            items_raw.append(item_obj)
-            all_news.append(item_obj)
-
-        per_source_raw.append((src_url, items_raw))
-
-    seen = set()
-    unique_news = []
-    for news in all_news:
-        if news["url"] not in seen:
-            unique_news.append(news)
-            seen.add(news["url"])
-
-    total_with_dups = len(all_news)
-    total_unique = len(unique_news)
-    print(f"\n✅ minfin - результат:")
-    print(f"   Усього знайдено {total_with_dups} (з урахуванням дублів)")
-    print(f"   Унікальних новин: {total_unique}\n")
-
-    printed_urls = set()
-    for src_url, items_raw in per_source_raw:
-        to_print = []
-        for it in items_raw:
-            if it["url"] in printed_urls:
-                continue
-            to_print.append(it)
-            printed_urls.add(it["url"])
-
-        print(f"🟢Джерело: {src_url} — {len(to_print)} новин:")
-        for i, n in enumerate(to_print, 1):
-            print(f"{i}. {n['title']} ({n['date']})\n   {n['url']}")
-        print()
-
-    return unique_news
+        items.append(NewsItem.new(title_tag.text(), url, news_date, src_url))
+    return items
 
-if __name__ == "__main__":
+class _SectionOrder:
+    # розділи приходять у довільному порядку, а віддаємо їх у порядку SECTIONS:
+    # тоді SourceResult.unique завжди віддає URL першому розділу — атрибуція детермінована
+    def __init__(self, src_urls: tuple[str, ...]):
+        self.src_urls = src_urls
+        self.sections: dict[str, list[NewsItem]] = {}
+
+    def add(self, src_url: str, items: list[NewsItem]):
+        self.sections[src_url] = items
+
+    def result(self) -> list[NewsItem]:
+        # з дублями: «Усього знайдено» у блоці рахує і їх
+        return [n for src_url in self.src_urls for n in self.sections.get(src_url, ())]
+
+async def _fetch_page(src_url: str):
     try:
-        parse_minfin()
+        return await page_cache.fetch(src_url, source="minfin", headers=HEADERS)
     except Exception as e:
-        print(f"❌ Помилка minfin_parser: {e}")
\ No newline at end of file
+        log.warning("⚠️ Не вдалося отримати %s: %s", src_url, e)
+        return None
+
+async def parse_minfin(today_only: bool = False) -> list[NewsItem]:
+    backend = html_backends.backend_for("minfin")
+    *sub_urls, feed_url = SOURCE_URLS
+    # усі чотири сторінки качаємо одночасно
+    pages = {u: asyncio.create_task(_fetch_page(u)) for u in SOURCE_URLS}
+    try:
+        sections = _SectionOrder(SOURCE_URLS)
+        known: dict[str, NewsItem] = {}
+        oldest = oldest_date(today_only)
+
+        async def section(src_url: str):
+            page = await pages[src_url]
+            if page is not None:
+                # перша сторінка вже є; далі — пагінація до межі вікна
+                items = await crawler.crawl_items(
+                    src_url, _collect_section, src_url, backend,
+                    source="minfin", headers=HEADERS, oldest=oldest, first_page=page,
+                )
+                sections.add(src_url, filter_by_date(items, today_only, source="minfin"))
+                # для пропусків беремо всі рядки підрозділу, а не лише свіжі
+                known.update((n.url, n) for n in items)
+
+        await asyncio.gather(*(section(u) for u in sub_urls))
+
+        page = await pages[feed_url]
+        if page is None and not sections.sections:
+            # жодна сторінка не відповіла — це збій джерела, а не порожня стрічка
+            raise RuntimeError("усі сторінки minfin недоступні")
+        if page is not None:
+            skip = frozenset(known) if SKIP_KNOWN_IN_FEED else frozenset()
+            items = await crawler.crawl_items(
+                feed_url, _collect_section, feed_url, backend, skip,
+                source="minfin", headers=HEADERS, oldest=oldest, first_page=page, variant=skip,
+            )
+            # пропущені рядки — дублі підрозділів; відновлюємо їх, щоб підсумок
+            # «з урахуванням дублів» не залежав від MINFIN_SKIP_KNOWN
+            items.extend(
+                NewsItem.new(known[url].title, url, date.fromordinal(day), feed_url)
+                for url, day in items.skipped
+            )
+            sections.add(feed_url, filter_by_date(items, today_only, source="minfin"))
+
+        # дублі між розділами прибирає і рахує рушій (SourceResult.unique)
+        return sections.result()
+    finally:
+        # дедлайн джерела міг перервати збір — не лишаємо завантажень-сиріт
+        for t in pages.values():
+            t.cancel()
+
+if __name__ == "__main__":
+    from groups.easy_sources import main
+    main("minfin")
@@ -1,39 +1,27 @@
-import requests
-import xml.etree.ElementTree as ET
+from core import feeds
+from core.dates import filter_by_date, oldest_date
+from core.items import NewsItem
 
 RSS_URL = "https://news.google.com/rss/search?q=site:reuters.com/business&hl=en&gl=US&ceid=US:en"
+SOURCE_URL = "https://www.reuters.com/business"
 
-def fetch_rss(url):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    resp = requests.get(url, headers=headers, timeout=10)
-    resp.raise_for_status()
-    return resp.text
+HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-def parse_rss(xml_text):
-    root = ET.fromstring(xml_text)
-    items = root.findall(".//item")
+TOP_N = 30
 
-    news_list = []
-    for item in items:
-        title = item.findtext("title")
-        link = item.findtext("link")
-        if title and link:
-            news_list.append({"title": title.strip(), "link": link.strip()})
-    return news_list
+def parse_rss(xml_text):
+    return feeds.parse_feed(xml_text, SOURCE_URL, "reuters-business", top_n=TOP_N, ordered=False)
 
-def main():
-    print("🔍 Завантажую новини з Reuters (через Google News RSS)...")
-    try:
-        xml = fetch_rss(RSS_URL)
-        news = parse_rss(xml)
-        if not news:
-            print("⚠️ Не знайдено жодної новини.")
-        else:
-            print(f"✅ Знайдено {len(news)} новин:\n")
-            for n in news[:30]:
-                print(f"• {n['title']}\n  {n['link']}\n")
-    except Exception as e:
-        print(f"❌ Помилка під час отримання або обробки RSS: {e}")
+async def parse_reuters(today_only: bool = False) -> list[NewsItem]:
+    # вікно завжди «сьогодні+вчора»: збережений після 304 список підходить для обох команд
+    items = await feeds.fetch_feed(
+        RSS_URL, source="reuters", label=SOURCE_URL, section="reuters-business",
+        oldest=oldest_date(), top_n=TOP_N,
+        # пошук Google News сортує за релевантністю, а не за датою
+        ordered=False, headers=HEADERS,
+    )
+    return filter_by_date(items, today_only, source="reuters")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    from groups.easy_sources import main
+    main("reuters")
@@ -0,0 +1,66 @@
+# tests/test_crawler.py
+import asyncio
+import hashlib
+from datetime import date, timedelta
+
+from core import crawler, executor, html_backends, page_cache
+from parsers import minfin_parser
+
+FEED = minfin_parser.SOURCE_URLS[-1]
+TODAY = date.today()
+
+def _url(n: int) -> str:
+    return minfin_parser._normalize_url(f"/ua/news/{n}/")
+
+def _page(url: str, rows: list[tuple[int, date]], next_url: str | None = None) -> page_cache.Page:
+    body = "".join(
+        f'<li class="item"><span class="data" content="{d.isoformat()} 10:00"></span>'
+        f'<a href="/ua/news/{n}/">Новина {n}</a></li>'
+        for n, d in rows
+    )
+    if next_url:
+        body += f'<a class="next" href="{next_url}">далі</a>'
+    body = f"<html><body><ul>{body}</ul></body></html>".encode()
+    return page_cache.Page(url, "minfin", None, None, hashlib.blake2b(body).digest(), body)
+
+def _crawl(pages: dict[str, page_cache.Page], skip: frozenset, monkeypatch) -> crawler.PageItems:
+    async def fetch(url, *, source, headers=None):
+        return pages[url]
+
+    monkeypatch.setattr(executor, "PARSE_EXECUTOR", "thread")
+    monkeypatch.setattr(page_cache, "fetch", fetch)
+    page_cache.clear()
+
+    async def run():
+        try:
+            return await crawler.crawl_items(
+                FEED, minfin_parser._collect_section, FEED, html_backends.REFERENCE_BACKEND, skip,
+                source="minfin", oldest=(TODAY - timedelta(days=1)).toordinal(), variant=skip,
+            )
+        finally:
+            executor.shutdown()
+
+    return asyncio.run(run())
+
+def test_page_of_known_rows_does_not_stop_pagination(monkeypatch):
+    page2 = f"{FEED}?page=2"
+    pages = {
+        FEED: _page(FEED, [(1, TODAY), (2, TODAY)], next_url=page2),
+        page2: _page(page2, [(3, TODAY), (4, TODAY - timedelta(days=5))]),
+    }
+    known = frozenset(_url(n) for n in (1, 2))
+    items = _crawl(pages, known, monkeypatch)
+    # перша сторінка вся пропущена, але пагінація дійшла до другої
+    assert [n.url for n in items] == [_url(n) for n in (3, 4)]
+    assert [url for url, _ in items.skipped] == sorted(known)
+
+def test_known_rows_outside_window_stop_pagination(monkeypatch):
+    page2 = f"{FEED}?page=2"
+    old = TODAY - timedelta(days=5)
+    pages = {
+        FEED: _page(FEED, [(1, TODAY), (2, old)], next_url=page2),
+        page2: _page(page2, [(3, old)]),
+    }
+    known = frozenset(_url(n) for n in (1, 2))
+    items = _crawl(pages, known, monkeypatch)
+    assert list(items) == [] and len(items.skipped) == 2
@@ -0,0 +1,46 @@
+# tests/test_feeds.py
+import asyncio
+
+from aiohttp import web
+
+from benchmarks import fixtures
+from core import feeds, http_client
+
+FEED_URL = "https://example.com/rss"
+
+async def _fetch(always_304: bool) -> tuple[list, feeds.FeedStats, list[dict]]:
+    # сервер відповідає 304 навіть без валідаторів — як проміжний кеш після рестарту бота
+    seen: list[dict] = []
+    body = fixtures.load("reuters_rss")
+
+    async def handle(request: web.Request) -> web.Response:
+        seen.append(dict(request.headers))
+        if always_304 or request.headers.get("Cache-Control") != "no-cache":
+            return web.Response(status=304)
+        return web.Response(body=body, content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    http_client.set_url_rewrite(lambda url: f"http://127.0.0.1:{port}/")
+    feeds.clear()
+    try:
+        items = await feeds.fetch_feed(FEED_URL, source="test", label="Reuters", section="business")
+        return items, feeds._stats["test"], seen
+    finally:
+        http_client.set_url_rewrite(None)
+        await http_client.close()
+        await runner.cleanup()
+
+def test_304_without_cached_copy_refetches_unconditionally():
+    items, stats, seen = asyncio.run(_fetch(always_304=False))
+    assert items and stats.unexpected_304 == 1 and len(seen) == 2
+    assert "If-None-Match" not in seen[1] and seen[1]["Cache-Control"] == "no-cache"
+
+def test_repeated_304_gives_empty_feed_not_error():
+    items, stats, seen = asyncio.run(_fetch(always_304=True))
+    assert items == [] and len(seen) == 2
@@ -0,0 +1,38 @@
+# tests/test_html_backends.py
+import pytest
+
+from benchmarks import fixtures
+from core import html_backends
+from parsers import coindesk_parser, epravda_parser, minfin_parser
+
+# (фікстура, екстрактор, додаткові аргументи)
+CASES = [
+    ("epravda_finances", epravda_parser._collect_finances, ()),
+    *[(f"minfin_{i}", minfin_parser._collect_section, (url,)) for i, url in enumerate(minfin_parser.SOURCE_URLS)],
+    ("coindesk_latest", coindesk_parser._collect_latest, ()),
+]
+BACKENDS = [name for name in html_backends.BACKENDS if html_backends._available(name)]
+
+@pytest.fixture(scope="module")
+def reference():
+    # еталон: html.parser по всій сторінці, без SoupStrainer
+    return {
+        fixture: extract(fixtures.load(fixture), *args, backend=html_backends.REFERENCE_BACKEND, subtree=None)
+        for fixture, extract, args in CASES
+    }
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("with_subtree", [True, False], ids=["subtree", "full"])
+@pytest.mark.parametrize("fixture,extract,args", CASES, ids=[c[0] for c in CASES])
+def test_backends_extract_identical_items(reference, fixture, extract, args, backend, with_subtree):
+    html = fixtures.load(fixture)
+    kwargs = {"backend": backend}
+    if not with_subtree:
+        kwargs["subtree"] = None
+    items = extract(html, *args, **kwargs)
+    assert reference[fixture], f"{fixture}: еталон нічого не знайшов"
+    assert items == reference[fixture]
+
+@pytest.mark.parametrize("fixture,extract,args", CASES, ids=[c[0] for c in CASES])
+def test_compare_backends_reports_agreement(fixture, extract, args):
+    assert all(html_backends.compare_backends(extract, fixtures.load(fixture), *args).values())
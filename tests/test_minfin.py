@@ -0,0 +1,35 @@
+# tests/test_minfin.py
+import asyncio
+
+from benchmarks.run import StubServer
+from core import executor, http_client, page_cache
+from groups.easy_sources import SOURCES
+from groups.engine import SourceResult
+from parsers import minfin_parser
+
+MINFIN = next(s for s in SOURCES if s.name == "minfin")
+
+async def _collect() -> SourceResult:
+    # фікстури з benchmarks/ через локальний сервер, як у наскрізному бенчмарку
+    server = StubServer()
+    await server.start()
+    await executor.start()
+    try:
+        page_cache.clear()
+        return SourceResult(MINFIN, await minfin_parser.parse_minfin())
+    finally:
+        await http_client.close()
+        await server.stop()
+        executor.shutdown()
+
+def test_total_counts_duplicates_with_and_without_skip(monkeypatch):
+    monkeypatch.setattr(executor, "PARSE_EXECUTOR", "thread")
+    monkeypatch.setattr(minfin_parser, "SKIP_KNOWN_IN_FEED", True)
+    skipped = asyncio.run(_collect())
+    monkeypatch.setattr(minfin_parser, "SKIP_KNOWN_IN_FEED", False)
+    parsed = asyncio.run(_collect())
+
+    # загальна стрічка повторює підрозділи: «Усього» має бути більше за «Унікальних»
+    assert len(parsed.items) > len(parsed.unique)
+    assert len(skipped.items) == len(parsed.items)
+    assert [n.url for n in skipped.unique] == [n.url for n in parsed.unique]
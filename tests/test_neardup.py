@@ -0,0 +1,33 @@
+# tests/test_neardup.py
+import pytest
+
+from core import neardup
+
+DIFFERENT = [
+    ("Курс долара на 17 жовтня", "Курс долара на 18 жовтня"),
+    ("Bitcoin rises to $60,000", "Bitcoin falls to $60,000"),
+    ("НБУ підвищив облікову ставку до 15%", "НБУ знизив облікову ставку до 15%"),
+    ("Мінфін розмістив ОВДП на 12 млрд гривень", "Мінфін розмістив ОВДП на 15 млрд гривень"),
+]
+
+SAME = [
+    ("НБУ зберіг облікову ставку на рівні 15,5% - Мінфін",
+     "НБУ зберіг облікову ставку на рівні 15,5% річних — Економічна правда"),
+    ("Bitcoin ETF inflows hit record as price tops $70,000 - Reuters",
+     "Bitcoin ETF inflows hit a record as price tops $70,000"),
+    ("Мінфін розмістив ОВДП на 12 млрд гривень",
+     "Мінфін розмістив ОВДП на 12 млрд гривень на аукціоні у вівторок"),
+    ("Ukraine central bank keeps key rate at 15.5% - Reuters",
+     "Ukraine's central bank keeps its key rate at 15.5%"),
+]
+
+@pytest.mark.parametrize("a,b", DIFFERENT)
+def test_different_stories_stay_apart(a, b):
+    assert neardup.clusters([a, b]) == [[0], [1]]
+
+@pytest.mark.parametrize("a,b", SAME)
+def test_paraphrases_merge(a, b):
+    assert neardup.clusters([a, b]) == [[0, 1]]
+
+def test_numbers_are_not_stemmed():
+    assert neardup.tokens("Продажі 1000000 і 1000001") == {"продаж", "1000000", "1000001"}
@@ -0,0 +1,37 @@
+# tests/test_page_cache.py
+import asyncio
+
+from aiohttp import web
+
+from core import http_client, page_cache
+
+async def _fetch() -> tuple[page_cache.Page, list[dict]]:
+    # 304 на перший же запит, без наших валідаторів — як від проміжного кешу
+    seen: list[dict] = []
+
+    async def handle(request: web.Request) -> web.Response:
+        seen.append(dict(request.headers))
+        if request.headers.get("Cache-Control") != "no-cache":
+            return web.Response(status=304, headers={"ETag": '"stale"'})
+        return web.Response(body=b"<html>fresh</html>", headers={"ETag": '"fresh"'})
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    http_client.set_url_rewrite(lambda url: f"http://127.0.0.1:{port}/")
+    page_cache.clear()
+    try:
+        return await page_cache.fetch("https://example.com/news", source="test"), seen
+    finally:
+        http_client.set_url_rewrite(None)
+        await http_client.close()
+        await runner.cleanup()
+
+def test_304_without_cached_copy_is_not_cached_as_empty_page():
+    page, seen = asyncio.run(_fetch())
+    assert page.body == b"<html>fresh</html>" and page.etag == '"fresh"'
+    assert len(seen) == 2 and page_cache.stats()["test"]["unexpected_304"] == 1
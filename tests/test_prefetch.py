@@ -0,0 +1,53 @@
+# tests/test_prefetch.py
+import asyncio
+import mmap
+import time
+from datetime import date, timedelta
+
+from core.items import NewsItem
+from core.shared_snapshot import SharedSnapshot
+from groups.easy_sources import SOURCES
+from groups.engine import SourceResult
+from groups.prefetch import Prefetcher, SharedView
+
+TODAY = date.today()
+
+def _results(n: int) -> list[SourceResult]:
+    source = SOURCES[0]
+    return [SourceResult(source, [
+        NewsItem.new(f"Новина {i} — «тест» ✅", f"https://example.com/{n}/{i}",
+                     TODAY - timedelta(days=i % 2), source.feeds[0])
+        for i in range(n)
+    ])]
+
+def _prefetchers(path: str, results: list[list[SourceResult]]) -> tuple[Prefetcher, Prefetcher]:
+    batches = iter(results)
+
+    async def collect(today_only: bool) -> list[SourceResult]:
+        return next(batches)
+
+    leader, follower = Prefetcher(collect), Prefetcher(collect)
+    leader.share(SharedSnapshot(path))
+    follower.share(SharedSnapshot(path))
+    return leader, follower
+
+def test_follower_serves_leader_messages_from_mmap(tmp_path):
+    # 5 новин — одне повідомлення, 300 — кілька
+    leader, follower = _prefetchers(str(tmp_path / "snap"), [_results(5), _results(300)])
+    assert follower.messages() is None
+
+    asyncio.run(leader.refresh())
+    assert follower.messages() == leader.snapshot.messages
+    assert follower.messages(today_only=True) == leader.snapshot.today_messages
+    snap = follower.snapshot
+    assert isinstance(snap, SharedView) and snap.day == TODAY and snap.age < 60
+    # тексти не скопійовані: список тримає саму пам'ять відображення
+    assert isinstance(snap.messages._data.obj, mmap.mmap)
+
+    time.sleep(0.01)  # інший mtime для os.replace на грубих ФС
+    asyncio.run(leader.refresh())
+    assert follower.messages() == leader.snapshot.messages
+    assert follower.version == leader.version == 2
+    # попередня версія лишається читабельною, хоч файл уже замінено
+    assert len(snap.messages) == 1 and "https://example.com/5/4" in snap.messages[-1]
+    assert len(follower.messages()) > 1
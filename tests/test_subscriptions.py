@@ -0,0 +1,95 @@
+# tests/test_subscriptions.py
+import asyncio
+from datetime import datetime
+
+from delivery import subscriptions
+from delivery.subscriptions import DigestBroadcaster, SubscriptionStore
+
+SLOT = "2026-10-25T09:00"
+
+class FakeSender:
+    """Підтверджує перші `limit` повідомлень, решта висить — як при рестарті посеред розсилки."""
+
+    def __init__(self, limit: int | None = None):
+        self.limit = limit
+        self.sent: list[tuple[int, str]] = []
+
+    def send(self, chat_id, text, priority=0, **kwargs):
+        fut = asyncio.get_running_loop().create_future()
+        if self.limit is None or len(self.sent) < self.limit:
+            self.sent.append((chat_id, text))
+            fut.set_result(None)
+        return fut
+
+async def _no_digest():
+    raise AssertionError("дайджест слоту вже збережено")
+
+def _broadcaster(store, sender):
+    return DigestBroadcaster(store, sender, _no_digest, slots="09:00", tz="Europe/Kyiv")
+
+def test_delay_counts_dst_hour(monkeypatch):
+    b = _broadcaster(SubscriptionStore(":memory:"), FakeSender())
+    now = datetime(2026, 10, 24, 18, 30, tzinfo=b.tz)
+    at = b.next_slot(now)
+    assert at == datetime(2026, 10, 25, 9, 0, tzinfo=b.tz)
+    monkeypatch.setattr(subscriptions.time, "time", now.timestamp)
+    # о 04:00 25 жовтня Київ переходить на зимовий час: до 09:00 — 15.5 год, не 14.5
+    assert b.delay_until(at) == 15.5 * 3600
+
+def test_restart_resumes_from_next_message(tmp_path):
+    path = str(tmp_path / "news.db")
+    messages = ["перша", "друга", "третя"]
+
+    async def interrupted():
+        store = SubscriptionStore(path)
+        store.add(1)
+        store.open_run(SLOT, messages)
+        sender = FakeSender(limit=2)
+        task = asyncio.create_task(_broadcaster(store, sender).run_slot(SLOT))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if store.pending(SLOT, len(messages)) == [(1, 2)]:
+                break
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        store.close()
+        return sender.sent
+
+    async def resumed():
+        store = SubscriptionStore(path)
+        sender = FakeSender()
+        assert store.unfinished_runs() == [SLOT]
+        await _broadcaster(store, sender).run_slot(SLOT)
+        assert store.unfinished_runs() == []
+        store.close()
+        return sender.sent
+
+    assert asyncio.run(interrupted()) == [(1, "перша"), (1, "друга")]
+    assert asyncio.run(resumed()) == [(1, "третя")]
+
+class FlakySender(FakeSender):
+    """Друге повідомлення першої спроби падає тимчасовою помилкою."""
+
+    def __init__(self):
+        super().__init__()
+        self.attempts = 0
+
+    def send(self, chat_id, text, priority=0, **kwargs):
+        self.attempts += 1
+        if self.attempts == 2:
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_exception(TimeoutError("read timeout"))
+            return fut
+        return super().send(chat_id, text, priority, **kwargs)
+
+def test_transient_error_retries_from_reached_message(tmp_path, monkeypatch):
+    monkeypatch.setattr(subscriptions, "FANOUT_RETRY_SEC", 0)
+    store = SubscriptionStore(str(tmp_path / "news.db"))
+    store.add(1)
+    store.open_run(SLOT, ["перша", "друга", "третя"])
+    sender = FlakySender()
+    b = _broadcaster(store, sender)
+
+    asyncio.run(b.run_slot(SLOT))
+    assert sender.sent == [(1, "перша"), (1, "друга"), (1, "третя")]
+    assert b.failed == 1 and b.delivered == 1